@@ -1,9 +1,13 @@
 from __future__ import annotations
-import copy
 import random
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from adversarial_search.connect_puzzle import Connect, ConnectError
+from adversarial_search.connect_puzzle import Connect
+from adversarial_search.connect_transposition import Bound, TranspositionTable
+
+if TYPE_CHECKING:
+    from adversarial_search.connect_book import OpeningBook
 
 MAX: int = 1
 MIN: int = -1
@@ -21,29 +25,64 @@ class Move:
 
 
 def minmax(connect: Connect, depth: int, min_or_max: int = 1, slot: int = -1,
-           alpha: float = INFINITY_NEGATIVE, beta: float = INFINITY_POSITIVE) -> Move:
+           alpha: float = INFINITY_NEGATIVE, beta: float = INFINITY_POSITIVE,
+           table: TranspositionTable | None = None, book: OpeningBook | None = None) -> Move:
     current_score: int = connect.get_score_for_ai()
     if current_score != 0 or connect.is_board_full or depth == 0:
         return Move(slot, current_score)
+    # В книге оценки точные, поиск не мельче нужного заменяет всё поддерево
+    if book is not None and (book_move := book.lookup(connect, depth)):
+        return book_move
+
+    key: int = 0
+    hint_slot: int = -1
+    if table is not None:
+        key = connect.position_key
+        if entry := table.get(key):
+            if entry.depth >= depth:
+                if entry.bound == Bound.EXACT:
+                    return Move(entry.slot, entry.score)
+                if entry.bound == Bound.LOWER:
+                    alpha = max(alpha, entry.score)
+                else:
+                    beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return Move(entry.slot, entry.score)
+            hint_slot = entry.slot
+    # Границы окна после сужения по таблице: оценка вне окна - лишь граница, а не точное значение
+    alpha_original, beta_original = alpha, beta
 
     best_move: Move = Move(-1, INFINITY_NEGATIVE * min_or_max)
     slots: list[int] = random.sample(range(connect.board_size_y), connect.board_size_y)
+    if hint_slot != -1:
+        # Лучший ход из таблицы проверяем первым: он чаще всего даёт отсечение
+        slots.remove(hint_slot)
+        slots.insert(0, hint_slot)
     for slot in slots:
-        try:
-            neighbor: Connect = copy.deepcopy(connect)
-            neighbor.play_move(slot)
-        except ConnectError:
-            pass
+        if connect.is_slot_full(slot):
+            continue
+        # Ход делается и отменяется на той же доске, без копирования
+        connect.play_move(slot)
+        move: Move = minmax(connect, depth - 1, min_or_max * -1, slot, alpha, beta, table, book)
+        connect.undo_move()
+        if min_or_max == MAX:
+            if move.score > best_move.score:
+                best_move = Move(slot, move.score)
+            alpha = max(alpha, best_move.score)
         else:
-            move: Move = minmax(neighbor, depth - 1, min_or_max * -1, slot)
-            if min_or_max == MAX:
-                best_move = max(best_move, move)
-                alpha = max(alpha, best_move.score)
-            else:
-                best_move = min(best_move, move)
-                beta = min(beta, best_move.score)
+            if move.score < best_move.score:
+                best_move = Move(slot, move.score)
+            beta = min(beta, best_move.score)
 
-            if alpha >= beta:
-                break
+        if alpha >= beta:
+            break
 
+    if table is not None:
+        if best_move.score <= alpha_original:
+            bound: Bound = Bound.UPPER
+        elif best_move.score >= beta_original:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        table.store(key, depth, best_move.score, bound, best_move.slot)
     return best_move
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import dataclass, replace
+from multiprocessing import Pool
+from time import perf_counter
+
+from adversarial_search.connect_ai import Move
+from adversarial_search.connect_mcts import MonteCarloTreeSearch
+from adversarial_search.connect_negamax import NegamaxSearch
+from adversarial_search.connect_puzzle import Connect, ConnectError
+from adversarial_search.connect_transposition import TranspositionTable
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    name: str
+    algorithm: str = 'negamax'
+    time_limit: float | None = 0.1
+    max_depth: int | None = None
+    # Для negamax - бюджет узлов на ход, для mcts - число итераций
+    max_nodes: int | None = None
+    table_size: int = 1 << 18
+
+    @classmethod
+    def parse(cls, spec: str) -> EngineConfig:
+        """Строка вида 'negamax:0.1' или 'mcts:0.5' - алгоритм и время на ход в секундах."""
+        algorithm, _, time_limit = spec.partition(':')
+        if algorithm not in ('negamax', 'mcts'):
+            raise ConnectError(f'Unknown algorithm {algorithm!r}!')
+        return cls(spec, algorithm, float(time_limit) if time_limit else cls.time_limit)
+
+
+class ArenaPlayer:
+    """Движок из конфигурации с накоплением статистики по своим ходам за одну партию."""
+
+    def __init__(self, config: EngineConfig, seed: int) -> None:
+        self.config: EngineConfig = config
+        if config.algorithm == 'mcts':
+            self.engine: NegamaxSearch | MonteCarloTreeSearch = MonteCarloTreeSearch(seed=seed)
+        else:
+            self.engine = NegamaxSearch(TranspositionTable(config.table_size))
+        self.moves: int = 0
+        self.nodes: int = 0
+        self.depth: int = 0
+        self.time: float = 0.0
+
+    def choose_slot(self, connect: Connect) -> int:
+        started_at: float = perf_counter()
+        if isinstance(self.engine, MonteCarloTreeSearch):
+            move: Move = self.engine.search(connect, self.config.time_limit, self.config.max_nodes)
+        else:
+            move = self.engine.iterative_deepening(connect, self.config.max_depth, self.config.time_limit,
+                                                   self.config.max_nodes)
+        self.time += perf_counter() - started_at
+        self.moves += 1
+        self.nodes += self.engine.nodes
+        self.depth += self.engine.depth_reached
+        return move.slot
+
+
+@dataclass
+class GameRecord:
+    first: str
+    second: str
+    winner: str | None
+    moves: int
+    # Статистика по имени движка: ходы, узлы, сумма глубин, время
+    stats: dict[str, tuple[int, int, int, float]]
+
+
+@dataclass
+class EngineReport:
+    name: str
+    games: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    moves: int = 0
+    nodes: int = 0
+    depth: int = 0
+    time: float = 0.0
+
+    def add(self, record: GameRecord) -> None:
+        moves, nodes, depth, time = record.stats[self.name]
+        self.games += 1
+        if record.winner is None:
+            self.draws += 1
+        elif record.winner == self.name:
+            self.wins += 1
+        else:
+            self.losses += 1
+        self.moves += moves
+        self.nodes += nodes
+        self.depth += depth
+        self.time += time
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def draw_rate(self) -> float:
+        return self.draws / self.games if self.games else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.time if self.time else 0.0
+
+    @property
+    def time_per_move(self) -> float:
+        return self.time / self.moves if self.moves else 0.0
+
+    @property
+    def average_depth(self) -> float:
+        return self.depth / self.moves if self.moves else 0.0
+
+
+GameTask = tuple[EngineConfig, EngineConfig, int, int, int, int]
+
+
+def play_game(task: GameTask) -> GameRecord:
+    """Партия без ввода: first ходит первым за AI, second - за HUMAN. Первые opening_plies
+        ходов случайные по seed, иначе детерминированные движки играли бы одну и ту же партию."""
+    first, second, board_size_x, board_size_y, seed, opening_plies = task
+    if first.name == second.name:
+        raise ConnectError('Engine configurations in a match need different names!')
+    connect: Connect = Connect(board_size_x, board_size_y)
+    randomizer: random.Random = random.Random(seed)
+    players: dict[str, ArenaPlayer] = {connect.AI: ArenaPlayer(first, seed), connect.HUMAN: ArenaPlayer(second, seed)}
+    for _ in range(opening_plies):
+        if not connect:
+            break
+        connect.play_move(randomizer.choice([slot for slot in range(board_size_y) if not connect.is_slot_full(slot)]))
+
+    while connect:
+        is_ai_turn: bool = connect.player_turn == connect.PLAYERS[connect.AI]
+        player: ArenaPlayer = players[connect.AI if is_ai_turn else connect.HUMAN]
+        connect.play_move(player.choose_slot(connect))
+
+    winner: str | None = None if connect.winner is None else players[connect.winner].config.name
+    return GameRecord(first.name, second.name, winner, connect.moves_count,
+                      {player.config.name: (player.moves, player.nodes, player.depth, player.time)
+                       for player in players.values()})
+
+
+def run_arena(first: EngineConfig, second: EngineConfig, games: int, board_size_x: int = 6, board_size_y: int = 7,
+              seed: int = 42, opening_plies: int = 2, processes: int | None = None) -> list[EngineReport]:
+    """Играет games партий, меняя цвета через партию. processes > 1 - партии идут в пуле процессов;
+        время на ход тогда делят процессы на одних ядрах, для замеров скорости лучше 1 процесс на ядро.
+        Одноимённые конфигурации (матч движка с самим собой) получают суффиксы #1 и #2."""
+    if first.name == second.name:
+        first, second = replace(first, name=f'{first.name}#1'), replace(second, name=f'{second.name}#2')
+    tasks: list[GameTask] = [(first, second, board_size_x, board_size_y, seed + index, opening_plies)
+                             if index % 2 == 0 else
+                             (second, first, board_size_x, board_size_y, seed + index, opening_plies)
+                             for index in range(games)]
+    if processes and processes > 1:
+        with Pool(processes) as pool:
+            records: list[GameRecord] = pool.map(play_game, tasks, chunksize=1)
+    else:
+        records = [play_game(task) for task in tasks]
+
+    reports: list[EngineReport] = [EngineReport(first.name), EngineReport(second.name)]
+    for record in records:
+        for report in reports:
+            report.add(record)
+    return reports
+
+
+def print_reports(reports: list[EngineReport]) -> None:
+    print(f'{"engine":<16}{"games":>7}{"wins":>7}{"draws":>7}{"win rate":>10}{"draw rate":>11}'
+          f'{"nodes/s":>10}{"ms/move":>9}{"depth":>7}')
+    for report in reports:
+        print(f'{report.name:<16}{report.games:>7}{report.wins:>7}{report.draws:>7}{report.win_rate:>10.2f}'
+              f'{report.draw_rate:>11.2f}{report.nodes_per_second:>10.0f}{report.time_per_move * 1000:>9.1f}'
+              f'{report.average_depth:>7.1f}')
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Connect engine-vs-engine arena')
+    parser.add_argument('engines', nargs=2, type=EngineConfig.parse, metavar='ALGORITHM[:SECONDS]',
+                        help='two engine configurations, e.g. negamax:0.1 mcts:0.1')
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--board', nargs=2, type=int, default=[6, 7], metavar=('X', 'Y'))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--opening-plies', type=int, default=2)
+    parser.add_argument('--processes', type=int, default=1)
+    args: argparse.Namespace = parser.parse_args()
+
+    first, second = args.engines
+    board_size_x, board_size_y = args.board
+    print_reports(run_arena(first, second, args.games, board_size_x, board_size_y, seed=args.seed,
+                            opening_plies=args.opening_plies, processes=args.processes))
+
+
+if __name__ == '__main__':
+    main()
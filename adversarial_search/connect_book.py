@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+from time import perf_counter
+
+from adversarial_search.connect_ai import Move
+from adversarial_search.connect_negamax import NegamaxSearch
+from adversarial_search.connect_puzzle import Connect, ConnectError
+from adversarial_search.connect_transposition import TranspositionTable
+
+
+class BookFormatError(ConnectError):
+    ...
+
+
+class OpeningBook:
+    """Книга дебютов в файле: заголовок и отсортированные по ключу записи фиксированной длины
+        (ключ позиции, лучший слот, оценка для AI, глубина поиска). Файл отображается в память
+        через mmap, поиск - двоичный, поэтому книга не загружается в память целиком.
+        Ключ - хэш Zobrist с учётом очерёдности, как в таблице транспозиций; он зависит от размеров
+        доски и ZOBRIST_SEED, поэтому они записаны в заголовок и сверяются при поиске."""
+    MAGIC: bytes = b'CNB1'
+    HEADER: struct.Struct = struct.Struct('<4sIIIII')
+    RECORD: struct.Struct = struct.Struct('<QbbB')
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            # Пустой файл mmap отобразить не может, а короткий не прочитает struct: проверяем размер заранее
+            file_size: int = os.fstat(file.fileno()).st_size
+            if file_size < self.HEADER.size:
+                raise BookFormatError(f'File {path} is too short for an opening book!')
+            magic, *sizes = self.HEADER.unpack(file.read(self.HEADER.size))
+            if magic != self.MAGIC:
+                raise BookFormatError(f'File {path} is not an opening book!')
+            self.board_size_x, self.board_size_y, self.winning_sequence_count, self.zobrist_seed, self.count = (
+                int(size) for size in sizes)
+            if file_size != self.HEADER.size + self.count * self.RECORD.size:
+                raise BookFormatError(f'File {path} is truncated!')
+            self.memory: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> OpeningBook:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self.memory.close()
+
+    def is_compatible(self, connect: Connect) -> bool:
+        return (self.board_size_x, self.board_size_y, self.winning_sequence_count, self.zobrist_seed) == (
+            connect.board_size_x, connect.board_size_y, connect.winning_sequence_count, connect.ZOBRIST_SEED)
+
+    def get_record(self, index: int) -> tuple[int, int, int, int]:
+        key, slot, score, depth = self.RECORD.unpack_from(self.memory, self.HEADER.size + index * self.RECORD.size)
+        return int(key), int(slot), int(score), int(depth)
+
+    def lookup(self, connect: Connect, min_depth: int = 0) -> Move | None:
+        """Лучший ход из книги или None, если позиции нет или она искалась мельче min_depth."""
+        if not self.is_compatible(connect):
+            return None
+        key: int = connect.position_key
+        low, high = 0, self.count
+        while low < high:
+            middle: int = (low + high) // 2
+            if self.get_record(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count:
+            return None
+        record_key, slot, score, depth = self.get_record(low)
+        if record_key != key or depth < min_depth:
+            return None
+        return Move(slot, score)
+
+    @classmethod
+    def generate(cls, path: str, connect: Connect, plies: int, search_depth: int | None = None,
+                 table_size: int = TranspositionTable.DEFAULT_SIZE) -> int:
+        """Перебирает все позиции до plies ходов от данной и ищет каждую на search_depth
+            (None - до конца партии, то есть решает её). Таблица транспозиций общая на все позиции,
+            поэтому более поздние позиции почти целиком находятся в ней. Возвращает число записей."""
+        engine: NegamaxSearch = NegamaxSearch(TranspositionTable(table_size))
+        records: dict[int, tuple[int, int, int]] = {}
+
+        def visit(ply: int) -> None:
+            key: int = connect.position_key
+            if key in records or not connect:
+                return
+            move: Move = engine.iterative_deepening(connect, search_depth)
+            depth: int = engine.depth_reached
+            if move.score != 0:
+                # Доказанный выигрыш или проигрыш точен на любой глубине
+                depth = connect.board_size_x * connect.board_size_y - connect.moves_count
+            records[key] = (move.slot, int(move.score), min(depth, 255))
+            if ply < plies:
+                for slot in range(connect.board_size_y):
+                    if not connect.is_slot_full(slot):
+                        connect.play_move(slot)
+                        visit(ply + 1)
+                        connect.undo_move()
+
+        visit(0)
+        with open(path, 'wb') as file:
+            file.write(cls.HEADER.pack(cls.MAGIC, connect.board_size_x, connect.board_size_y,
+                                       connect.winning_sequence_count, connect.ZOBRIST_SEED, len(records)))
+            for key in sorted(records):
+                file.write(cls.RECORD.pack(key, *records[key]))
+        return len(records)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Connect opening book generator')
+    parser.add_argument('output')
+    parser.add_argument('--plies', type=int, default=8, help='store every position up to this many moves')
+    parser.add_argument('--depth', type=int, help='search depth per position, solve to the end by default')
+    parser.add_argument('--board', nargs=2, type=int, default=[5, 4], metavar=('X', 'Y'))
+    parser.add_argument('--sequence', type=int, default=Connect.WINNING_SEQUENCE_COUNT)
+    args: argparse.Namespace = parser.parse_args()
+
+    started_at: float = perf_counter()
+    connect: Connect = Connect(args.board[0], args.board[1], args.sequence)
+    count: int = OpeningBook.generate(args.output, connect, args.plies, args.depth)
+    print(f'Positions: {count}, Time: {perf_counter() - started_at:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
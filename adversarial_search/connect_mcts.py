@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import math
+import random
+from time import perf_counter
+
+from adversarial_search.connect_ai import Move
+from adversarial_search.connect_puzzle import Connect
+
+
+class Node:
+    def __init__(self, key: int, slot: int = -1, parent: Node | None = None, player: str | None = None) -> None:
+        # Хэш Zobrist позиции узла: по нему находится новый корень при переиспользовании дерева
+        self.key: int = key
+        self.slot: int = slot
+        self.parent: Node | None = parent
+        # Игрок, сделавший ход в этот узел: его выигрыши и копятся в wins
+        self.player: str | None = player
+        self.children: dict[int, Node] = {}
+        self.untried_slots: list[int] | None = None
+        self.visits: int = 0
+        self.wins: float = 0.0
+
+    def get_uct(self, exploration: float, log_visits: float) -> float:
+        return self.wins / self.visits + exploration * math.sqrt(log_visits / self.visits)
+
+
+class MonteCarloTreeSearch:
+    """UCT: спуск по дереву с выбором по верхней доверительной границе, раскрытие одного хода,
+        случайная партия до конца и обратное распространение результата. Все ходы делаются
+        и отменяются на одной доске через play_move/undo_move. Дерево переиспользуется между
+        ходами партии: при следующем поиске корнем становится внук прошлого корня
+        после ответа соперника (или сын, если ход был один)."""
+    EXPLORATION: float = math.sqrt(2)
+    TIME_CHECK_INTERVAL: int = 64
+
+    def __init__(self, exploration: float = EXPLORATION, seed: int | None = None) -> None:
+        self.exploration: float = exploration
+        self.randomizer: random.Random = random.Random(seed)
+        self.root: Node | None = None
+        self.iterations: int = 0
+        self.nodes: int = 0
+        self.depth_reached: int = 0
+        self.wall_time: float = 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.wall_time if self.wall_time else 0.0
+
+    def reuse_tree(self, connect: Connect) -> Node:
+        """Ищет текущую позицию среди корня прошлого поиска, его детей и внуков,
+            иначе начинает дерево заново."""
+        candidates: list[Node] = []
+        if self.root is not None:
+            candidates.append(self.root)
+            for child in self.root.children.values():
+                candidates.append(child)
+                candidates.extend(child.children.values())
+        for node in candidates:
+            if node.key == connect.zobrist_hash:
+                node.parent = None
+                return node
+        return Node(connect.zobrist_hash)
+
+    def get_player(self, connect: Connect) -> str:
+        return connect.AI if connect.player_turn == connect.PLAYERS[connect.AI] else connect.HUMAN
+
+    def get_slots(self, connect: Connect) -> list[int]:
+        return [slot for slot in range(connect.board_size_y) if not connect.is_slot_full(slot)]
+
+    def select(self, node: Node) -> Node:
+        log_visits: float = math.log(node.visits)
+        return max(node.children.values(), key=lambda child: child.get_uct(self.exploration, log_visits))
+
+    def playout(self, connect: Connect) -> tuple[str | None, int]:
+        """Случайная партия до конца. Возвращает победителя и число сделанных ходов для отката."""
+        moves: int = 0
+        while connect:
+            slot: int = self.randomizer.randrange(connect.board_size_y)
+            while connect.is_slot_full(slot):
+                slot = self.randomizer.randrange(connect.board_size_y)
+            connect.play_move(slot)
+            moves += 1
+        return connect.winner, moves
+
+    def run_iteration(self, connect: Connect, root: Node) -> None:
+        node: Node = root
+        depth: int = 0
+        # Спуск по полностью раскрытым узлам
+        while node.untried_slots is not None and not node.untried_slots and node.children:
+            node = self.select(node)
+            connect.play_move(node.slot)
+            depth += 1
+        # Раскрытие одного нового хода
+        if connect:
+            if node.untried_slots is None:
+                node.untried_slots = self.get_slots(connect)
+                self.randomizer.shuffle(node.untried_slots)
+            slot: int = node.untried_slots.pop()
+            child: Node = Node(0, slot, node, self.get_player(connect))
+            node.children[slot] = child
+            connect.play_move(slot)
+            child.key = connect.zobrist_hash
+            node = child
+            depth += 1
+        self.depth_reached = max(self.depth_reached, depth)
+
+        winner, moves = self.playout(connect)
+        self.nodes += depth + moves
+        for _ in range(depth + moves):
+            connect.undo_move()
+
+        visited: Node | None = node
+        while visited is not None:
+            visited.visits += 1
+            if winner is None:
+                visited.wins += 0.5
+            elif winner == visited.player:
+                visited.wins += 1
+            visited = visited.parent
+
+    def search(self, connect: Connect, time_limit: float | None = None, max_iterations: int | None = None) -> Move:
+        """Итерации идут до исчерпания времени (секунды) или числа итераций; хотя бы одно
+            ограничение нужно задать, число итераций - не меньше 1. Ход - самый посещённый,
+            оценка - доля выигрышей, приведённая к шкале get_score_for_ai."""
+        if time_limit is None and max_iterations is None:
+            raise ValueError('MCTS needs a time limit or an iteration limit!')
+        if max_iterations is not None and max_iterations < 1:
+            raise ValueError(f'MCTS needs at least one iteration, got {max_iterations}!')
+        if not connect:
+            return Move(-1, connect.get_score_for_ai())
+        started_at: float = perf_counter()
+        root: Node = self.reuse_tree(connect)
+        self.root = root
+        self.iterations = 0
+        self.nodes = 0
+        self.depth_reached = 0
+        while max_iterations is None or self.iterations < max_iterations:
+            if (time_limit is not None and not self.iterations % self.TIME_CHECK_INTERVAL
+                    and perf_counter() - started_at > time_limit and self.iterations):
+                break
+            self.run_iteration(connect, root)
+            self.iterations += 1
+        self.wall_time = perf_counter() - started_at
+
+        best: Node = max(root.children.values(), key=lambda child: child.visits)
+        win_rate: float = best.wins / best.visits
+        ai_win_rate: float = win_rate if best.player == connect.AI else 1 - win_rate
+        return Move(best.slot, round((2 * ai_win_rate - 1) * 10, 2))
+
+
+def main() -> None:
+    print('---Monte Carlo Tree Search, 1 second on 6x7---')
+    engine: MonteCarloTreeSearch = MonteCarloTreeSearch(seed=42)
+    move: Move = engine.search(Connect(6, 7), time_limit=1.0)
+    print(f'Best move: {move.slot + 1}, Score: {move.score}, Iterations: {engine.iterations}, '
+          f'Depth: {engine.depth_reached}, Nodes/s: {engine.nodes_per_second:.0f}')
+
+
+if __name__ == '__main__':
+    main()
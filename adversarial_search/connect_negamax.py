@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from time import perf_counter
+
+from adversarial_search.connect_ai import INFINITY_NEGATIVE, INFINITY_POSITIVE, Move
+from adversarial_search.connect_puzzle import Connect
+from adversarial_search.connect_transposition import Bound, TranspositionTable
+
+
+class SearchTimeout(Exception):
+    ...
+
+
+class NegamaxSearch:
+    """Negamax с передачей окна alpha-beta в потомков и поиском главного варианта (PVS):
+        первый ход ищется с полным окном, остальные - с нулевым, и лишь при его пробое - повторно.
+        Оценки внутри поиска - с точки зрения ходящей стороны, наружу отдаются как в minmax,
+        с точки зрения AI. В таблице хранятся оценки negamax, поэтому делить её с minmax нельзя."""
+
+    KILLERS_PER_PLY: int = 2
+    # Как часто (в узлах) сверяться с часами: perf_counter на каждом узле заметно дороже самого узла
+    TIME_CHECK_INTERVAL: int = 1024
+
+    def __init__(self, table: TranspositionTable | None = None) -> None:
+        self.table: TranspositionTable | None = table
+        self.nodes: int = 0
+        self.depth_reached: int = 0
+        self.deadline: float | None = None
+        self.max_nodes: int | None = None
+        self.pv_slot: int = -1
+        # Ходы, давшие отсечение на той же глубине в соседних ветках, и общий счёт отсечений по слотам
+        self.killers: list[list[int]] = []
+        self.history: list[int] = []
+        self.center_order: list[int] = []
+
+    @staticmethod
+    def get_color(connect: Connect) -> int:
+        return 1 if connect.player_turn == connect.PLAYERS[connect.AI] else -1
+
+    def prepare(self, connect: Connect) -> None:
+        """Подготовка к новому поиску: счётчики узлов и глубины считаются заново для каждого вызова."""
+        self.nodes = 0
+        self.depth_reached = 0
+        if len(self.center_order) != connect.board_size_y:
+            center: float = (connect.board_size_y - 1) / 2
+            self.center_order = sorted(range(connect.board_size_y), key=lambda slot: abs(slot - center))
+            self.history = [0] * connect.board_size_y
+        self.killers = [[] for _ in range(connect.board_size_x * connect.board_size_y + 1)]
+
+    def get_slots(self, connect: Connect, hint_slot: int, ply: int = 0) -> list[int]:
+        """Порядок ходов: лучший ход из таблицы (главный вариант), killer-ходы этой глубины,
+            затем по счёту истории, при равенстве - ближе к центру."""
+        if not self.center_order:
+            self.prepare(connect)
+        slots: list[int] = [slot for slot in self.center_order if not connect.is_slot_full(slot)]
+        slots.sort(key=lambda slot: -self.history[slot])
+        first: list[int] = [hint_slot] if hint_slot in slots else []
+        if ply < len(self.killers):
+            first += [slot for slot in self.killers[ply] if slot in slots and slot not in first]
+        return first + [slot for slot in slots if slot not in first]
+
+    def record_cutoff(self, slot: int, depth: int, ply: int) -> None:
+        killers: list[int] = self.killers[ply]
+        if slot not in killers:
+            killers.insert(0, slot)
+            del killers[self.KILLERS_PER_PLY:]
+        self.history[slot] += depth * depth
+
+    def check_budget(self) -> None:
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchTimeout('Node budget is exhausted!')
+        if (self.deadline is not None and not self.nodes % self.TIME_CHECK_INTERVAL
+                and perf_counter() > self.deadline):
+            raise SearchTimeout('Time budget is exhausted!')
+
+    def negamax(self, connect: Connect, depth: int, alpha: float, beta: float, ply: int = 0) -> tuple[float, int]:
+        """Возвращает (оценка для ходящей стороны, лучший слот). Оценка fail-soft:
+            ниже alpha - верхняя граница, выше beta - нижняя."""
+        self.nodes += 1
+        self.check_budget()
+        if connect.winner is not None or connect.is_board_full or depth == 0:
+            return self.get_color(connect) * connect.get_score_for_ai(), -1
+
+        key: int = 0
+        hint_slot: int = -1
+        if self.table is not None:
+            key = connect.position_key
+            if entry := self.table.get(key):
+                if entry.depth >= depth:
+                    if entry.bound == Bound.EXACT:
+                        return entry.score, entry.slot
+                    if entry.bound == Bound.LOWER:
+                        alpha = max(alpha, entry.score)
+                    else:
+                        beta = min(beta, entry.score)
+                    if alpha >= beta:
+                        return entry.score, entry.slot
+                hint_slot = entry.slot
+        if ply == 0 and hint_slot == -1:
+            hint_slot = self.pv_slot
+        # Границы окна после сужения по таблице: оценка ниже alpha - лишь верхняя граница
+        alpha_original: float = alpha
+
+        best_score: float = INFINITY_NEGATIVE
+        best_slot: int = -1
+        for index, slot in enumerate(self.get_slots(connect, hint_slot, ply)):
+            connect.play_move(slot)
+            if index == 0:
+                score: float = -self.negamax(connect, depth - 1, -beta, -alpha, ply + 1)[0]
+            else:
+                # Оценки целые, поэтому окно шириной 1 только проверяет, лучше ли ход текущего
+                score = -self.negamax(connect, depth - 1, -alpha - 1, -alpha, ply + 1)[0]
+                if alpha < score < beta:
+                    score = -self.negamax(connect, depth - 1, -beta, -alpha, ply + 1)[0]
+            connect.undo_move()
+
+            if score > best_score:
+                best_score, best_slot = score, slot
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.record_cutoff(slot, depth, ply)
+                break
+
+        if self.table is not None:
+            if best_score <= alpha_original:
+                bound: Bound = Bound.UPPER
+            elif best_score >= beta:
+                bound = Bound.LOWER
+            else:
+                bound = Bound.EXACT
+            self.table.store(key, depth, best_score, bound, best_slot)
+        return best_score, best_slot
+
+    def search(self, connect: Connect, depth: int) -> Move:
+        self.prepare(connect)
+        score, slot = self.negamax(connect, depth, INFINITY_NEGATIVE, INFINITY_POSITIVE)
+        self.depth_reached = depth
+        return Move(slot, self.get_color(connect) * score)
+
+    def mtdf(self, connect: Connect, depth: int, guess: float = 0) -> Move:
+        """MTD(f): серия поисков с нулевым окном, сходящихся к точной оценке.
+            Без таблицы повторные проходы пересчитывали бы всё заново, поэтому она создаётся при необходимости."""
+        if self.table is None:
+            self.table = TranspositionTable()
+        self.prepare(connect)
+        lower, upper = INFINITY_NEGATIVE, INFINITY_POSITIVE
+        score: float = guess
+        best_slot: int = -1
+        while lower < upper:
+            beta: float = score + 1 if score == lower else score
+            score, slot = self.negamax(connect, depth, beta - 1, beta)
+            if score < beta:
+                upper = score
+            else:
+                # Слот берём только из доказанной нижней границы: он действительно её достигает
+                lower = score
+                best_slot = slot
+        if best_slot == -1:
+            best_slot = slot
+        self.depth_reached = depth
+        return Move(best_slot, self.get_color(connect) * score)
+
+    def iterative_deepening(self, connect: Connect, max_depth: int | None = None,
+                            time_limit: float | None = None, max_nodes: int | None = None) -> Move:
+        """Углубляет поиск на 1 до исчерпания бюджета времени (секунды) или узлов и отдаёт
+            результат последней завершённой итерации. Первая итерация выполняется всегда,
+            поэтому ход есть даже при нулевом бюджете."""
+        self.prepare(connect)
+        self.history = [score // 2 for score in self.history]
+        self.pv_slot = -1
+        empty_cells: int = connect.board_size_x * connect.board_size_y - connect.moves_count
+        max_depth = empty_cells if max_depth is None else min(max_depth, empty_cells)
+        started_at: float = perf_counter()
+        history_size: int = len(connect.history)
+
+        best_move: Move = Move(-1, 0)
+        for depth in range(1, max(max_depth, 1) + 1):
+            if depth > 1:
+                self.deadline = None if time_limit is None else started_at + time_limit
+                self.max_nodes = max_nodes
+            try:
+                score, slot = self.negamax(connect, depth, INFINITY_NEGATIVE, INFINITY_POSITIVE)
+            except SearchTimeout:
+                # Поиск прерван посреди ветки: откатываем сделанные в ней ходы
+                while len(connect.history) > history_size:
+                    connect.undo_move()
+                break
+            finally:
+                self.deadline = None
+                self.max_nodes = None
+            best_move = Move(slot, self.get_color(connect) * score)
+            self.pv_slot = slot
+            self.depth_reached = depth
+            if score != 0:
+                # Выигрыш или проигрыш доказан: глубже искать незачем
+                break
+        return best_move
+
+
+def main() -> None:
+    for title, method in (('---Negamax PVS---', NegamaxSearch.search), ('---Negamax MTD(f)---', NegamaxSearch.mtdf)):
+        print(title)
+        engine: NegamaxSearch = NegamaxSearch(TranspositionTable())
+        move: Move = method(engine, Connect(), 12)
+        print(f'Best move: {move.slot + 1}, Score: {move.score}, Nodes: {engine.nodes}')
+
+    print('---Iterative Deepening, 1 second on 6x7---')
+    engine = NegamaxSearch(TranspositionTable())
+    move = engine.iterative_deepening(Connect(6, 7), time_limit=1.0)
+    print(f'Best move: {move.slot + 1}, Score: {move.score}, Nodes: {engine.nodes}, Depth: {engine.depth_reached}')
+
+
+if __name__ == '__main__':
+    main()
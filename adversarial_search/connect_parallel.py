@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import random
+from multiprocessing.pool import Pool
+from time import perf_counter, time
+
+from adversarial_search.connect_ai import Move
+from adversarial_search.connect_negamax import NegamaxSearch
+from adversarial_search.connect_puzzle import Connect
+from adversarial_search.connect_transposition import TranspositionTable
+
+RootTask = tuple[Connect, int, int, float | None, int | None, int]
+RootResult = tuple[int, float, int, bool]
+
+
+def search_root_move(task: RootTask) -> RootResult:
+    """Ищет позицию после одного корневого хода на depth в отдельном процессе со своей таблицей.
+        Возвращает (слот, оценка для AI, число узлов, завершён ли поиск на всю глубину).
+        Доказанный выигрыш или проигрыш считается завершённым на любой глубине."""
+    connect, slot, depth, deadline, max_nodes, table_size = task
+    connect.play_move(slot)
+    engine: NegamaxSearch = NegamaxSearch(TranspositionTable(table_size))
+    time_limit: float | None = None if deadline is None else max(deadline - time(), 0.0)
+    move: Move = engine.iterative_deepening(connect, depth, time_limit, max_nodes)
+    empty_cells: int = connect.board_size_x * connect.board_size_y - connect.moves_count
+    is_complete: bool = engine.depth_reached >= min(depth, empty_cells) or move.score != 0
+    return slot, move.score, engine.nodes, is_complete
+
+
+class ParallelSearch:
+    """Разделение корня: каждый ход из корня ищется в своём процессе, так что число узлов
+        в секунду растёт с числом ядер (GIL не мешает). Все корневые ходы углубляются синхронно,
+        по раундам: раунд засчитывается, только если на его глубине завершились все ходы,
+        поэтому сравниваются лишь оценки одной глубины, даже когда ходов больше, чем процессов,
+        и часть ходов ждёт в очереди. Ходы с равной оценкой выбираются через seed, поэтому
+        при ограничении по глубине или узлам результат воспроизводим; ограничение по времени
+        зависит от скорости машины и определяет лишь, сколько раундов успеет завершиться."""
+    DEFAULT_TABLE_SIZE: int = 1 << 18
+
+    def __init__(self, processes: int | None = None, seed: int | None = None,
+                 table_size: int = DEFAULT_TABLE_SIZE) -> None:
+        self.pool: Pool = Pool(processes or os.cpu_count())
+        self.randomizer: random.Random = random.Random(seed)
+        self.table_size: int = table_size
+        self.nodes: int = 0
+        self.depth_reached: int = 0
+        self.wall_time: float = 0.0
+
+    def __enter__(self) -> ParallelSearch:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.pool.close()
+        self.pool.join()
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.wall_time if self.wall_time else 0.0
+
+    def search(self, connect: Connect, max_depth: int | None = None, time_limit: float | None = None,
+               max_nodes: int | None = None) -> Move:
+        """time_limit ограничивает весь поиск: раунд, не успевший завершиться, отбрасывается
+            и возвращается результат предыдущего. max_nodes - бюджет каждого хода в каждом раунде.
+            Первый раунд (глубина 1 после корневого хода) выполняется всегда."""
+        if not connect:
+            return Move(-1, connect.get_score_for_ai())
+        started_at: float = perf_counter()
+        # Абсолютное время по системным часам: perf_counter в разных процессах несравним
+        deadline: float | None = None if time_limit is None else time() + time_limit
+        slots: list[int] = [slot for slot in range(connect.board_size_y) if not connect.is_slot_full(slot)]
+        empty_cells: int = connect.board_size_x * connect.board_size_y - connect.moves_count
+        max_depth = empty_cells if max_depth is None else min(max_depth, empty_cells)
+        color: int = NegamaxSearch.get_color(connect)
+
+        self.nodes = 0
+        self.depth_reached = 0
+        best_score: float = 0
+        best_slots: list[int] = []
+        # depth - глубина поиска после корневого хода, с самим ходом глубина на 1 больше
+        for depth in range(1, max(max_depth - 1, 1) + 1):
+            tasks: list[RootTask] = [(connect, slot, depth, deadline if depth > 1 else None, max_nodes,
+                                      self.table_size) for slot in slots]
+            results: list[RootResult] = self.pool.map(search_root_move, tasks, chunksize=1)
+            self.nodes += sum(nodes for _, _, nodes, _ in results)
+            if not all(is_complete for _, _, _, is_complete in results):
+                break
+            best_score = max(color * score for _, score, _, _ in results)
+            best_slots = [slot for slot, score, _, _ in results if color * score == best_score]
+            self.depth_reached = depth + 1
+            # Выигрыш доказан или все ходы доказаны - глубже искать незачем
+            if best_score > 0 or all(score != 0 for _, score, _, _ in results):
+                break
+            if deadline is not None and time() >= deadline:
+                break
+        self.wall_time = perf_counter() - started_at
+        return Move(self.randomizer.choice(best_slots), color * best_score)
+
+
+def main() -> None:
+    print('---Parallel Root Search on 6x7---')
+    connect: Connect = Connect(6, 7)
+    for processes in (1, os.cpu_count() or 1):
+        with ParallelSearch(processes, seed=42) as engine:
+            move: Move = engine.search(connect, time_limit=1.0)
+            print(f'Processes: {processes}, Best move: {move.slot + 1}, Score: {move.score}, '
+                  f'Depth: {engine.depth_reached}, Nodes/s: {engine.nodes_per_second:.0f}')
+
+
+if __name__ == '__main__':
+    main()
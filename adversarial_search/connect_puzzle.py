@@ -1,3 +1,9 @@
+from __future__ import annotations
+
+import copy
+import random
+
+
 class ConnectError(Exception):
     ...
 
@@ -10,28 +16,103 @@ class WrongInputError(ConnectError):
     ...
 
 
+class EmptyHistoryError(ConnectError):
+    ...
+
+
 class Connect:
+    """Доска хранится битбордами: по целочисленной маске на игрока и счётчику высоты на слот.
+        Слот y занимает биты y * (board_size_x + 1) ... снизу вверх, верхний бит слота - всегда ноль,
+        он не даёт последовательностям перескакивать между слотами."""
     HUMAN: str = 'H'
     AI: str = 'A'
     PLAYERS: dict[str, int] = {HUMAN: -1, AI: 1}
 
     BOARD_EMPTY_SLOT: str = '_'
     WINNING_SEQUENCE_COUNT: int = 4
+    ZOBRIST_SEED: int = 2024
+    # Ключ стороны, которая ходит: одна и та же доска при разной очерёдности - разные позиции
+    TURN_KEY: int = 0x9E3779B97F4A7C15
 
-    def __init__(self, board_size_x: int = 5, board_size_y: int = 4) -> None:
+    def __init__(self, board_size_x: int = 5, board_size_y: int = 4,
+                 winning_sequence_count: int | None = None) -> None:
         self.board_size_x: int = board_size_x
         self.board_size_y: int = board_size_y
-        self.board: list[list[str]] = self.generate_board()
+        self.winning_sequence_count: int = winning_sequence_count or self.WINNING_SEQUENCE_COUNT
+        self.slot_height: int = board_size_x + 1
+        # Сдвиги до соседней клетки: по вертикали, по горизонтали и по двум диагоналям
+        self.shifts: tuple[int, ...] = (1, self.slot_height, self.slot_height + 1, self.slot_height - 1)
+        self.masks: dict[str, int] = {self.AI: 0, self.HUMAN: 0}
+        self.heights: list[int] = [0] * board_size_y
+        self.moves_count: int = 0
+        self.cached_winner: str | None = None
+        # Случайные 64-битные ключи Zobrist на каждую пару (игрок, бит доски)
+        randomizer: random.Random = random.Random(self.ZOBRIST_SEED)
+        self.zobrist_keys: dict[str, list[int]] = {
+            player: [randomizer.getrandbits(64) for _ in range(self.slot_height * board_size_y)]
+            for player in self.masks}
+        self.zobrist_hash: int = 0
+        # Стек ходов для undo_move: (игрок, слот, победитель до хода)
+        self.history: list[tuple[str, int, str | None]] = []
         self.player_turn: int = self.PLAYERS[self.AI]
 
     def __str__(self) -> str:
         return '\n'.join([''.join(row) for row in self.board])
 
-    def generate_board(self) -> list[list[str]]:
-        return [[self.BOARD_EMPTY_SLOT] * self.board_size_y for _ in range(self.board_size_x)]
+    def get_bit(self, x: int, y: int) -> int:
+        return 1 << (y * self.slot_height + self.board_size_x - 1 - x)
+
+    def get_cell(self, x: int, y: int) -> str:
+        bit: int = self.get_bit(x, y)
+        for player, mask in self.masks.items():
+            if mask & bit:
+                return player
+        return self.BOARD_EMPTY_SLOT
+
+    @property
+    def board(self) -> list[list[str]]:
+        return [[self.get_cell(x, y) for y in range(self.board_size_y)] for x in range(self.board_size_x)]
+
+    @board.setter
+    def board(self, board: list[list[str]]) -> None:
+        self.reset()
+        for y in range(self.board_size_y):
+            for x in reversed(range(self.board_size_x)):
+                player: str = board[x][y]
+                if player != self.BOARD_EMPTY_SLOT:
+                    bit: int = self.get_bit(x, y)
+                    self.masks[player] |= bit
+                    self.zobrist_hash ^= self.zobrist_keys[player][bit.bit_length() - 1]
+                    self.heights[y] += 1
+                    self.moves_count += 1
+        self.cached_winner = self.find_winner()
 
     def reset(self) -> None:
-        self.board = self.generate_board()
+        self.masks = {self.AI: 0, self.HUMAN: 0}
+        self.heights = [0] * self.board_size_y
+        self.moves_count = 0
+        self.cached_winner = None
+        self.zobrist_hash = 0
+        self.history = []
+
+    def copy(self) -> Connect:
+        """Дешёвая копия: маски - неизменяемые int, копируются только короткие списки."""
+        connect: Connect = copy.copy(self)
+        connect.masks = self.masks.copy()
+        connect.heights = self.heights.copy()
+        connect.history = self.history.copy()
+        return connect
+
+    @property
+    def hash_key(self) -> int:
+        return self.masks[self.AI] << (self.slot_height * self.board_size_y) | self.masks[self.HUMAN]
+
+    @property
+    def position_key(self) -> int:
+        """Хэш Zobrist с учётом очерёдности - ключ позиции в таблице транспозиций и книге дебютов."""
+        if self.player_turn == self.PLAYERS[self.AI]:
+            return self.zobrist_hash
+        return self.zobrist_hash ^ self.TURN_KEY
 
     def status_turn(self) -> str:
         return 'It is Human to play' if self.player_turn == self.PLAYERS[self.HUMAN] else 'It is AI to play'
@@ -41,27 +122,49 @@ class Connect:
             return 10 if winner == self.AI else -10
         return 0
 
+    def has_sequence(self, mask: int) -> bool:
+        for shift in self.shifts:
+            sequence: int = mask
+            for i in range(1, self.winning_sequence_count):
+                sequence &= mask >> (shift * i)
+            if sequence:
+                return True
+        return False
+
+    def find_winner(self) -> str | None:
+        for player, mask in self.masks.items():
+            if self.has_sequence(mask):
+                return player
+        return None
+
+    def is_winning_move(self, mask: int, position: int) -> bool:
+        """Проверяет только линии через только что поставленную фишку: O(WINNING_SEQUENCE_COUNT)."""
+        for shift in self.shifts:
+            count: int = 1
+            for direction in (-shift, shift):
+                index: int = position + direction
+                while count < self.winning_sequence_count and index >= 0 and mask >> index & 1:
+                    count += 1
+                    index += direction
+            if count >= self.winning_sequence_count:
+                return True
+        return False
+
     @property
     def winner(self) -> str | None:
-        for row in range(self.board_size_x):
-            for col in range(self.board_size_y):
-                offsets: list[tuple[int, int]] = [(1, 0), (0, 1), (1, 1), (1, -1)]  # Rows, cols, pos and neg diagonals
-                for offset_x, offset_y in offsets:
-                    if winner := self.has_a_row_from_point(row, col, offset_x, offset_y):
-                        return winner
-        return None
+        return self.cached_winner
 
     def __bool__(self) -> bool:
         return self.winner is None and not self.is_board_full
 
     def has_a_row_from_point(self, x: int, y: int, offset_x: int, offset_y: int) -> str | None:
-        winner: str = self.board[x][y]
-        if winner == '_':
+        winner: str = self.get_cell(x, y)
+        if winner == self.BOARD_EMPTY_SLOT:
             return None
-        for i in range(self.WINNING_SEQUENCE_COUNT - 1):
+        for i in range(self.winning_sequence_count - 1):
             x += offset_x
             y += offset_y
-            if not self.is_within_bounds(x, y) or self.board[x][y] != winner:
+            if not self.is_within_bounds(x, y) or self.get_cell(x, y) != winner:
                 return None
 
         return winner
@@ -70,20 +173,21 @@ class Connect:
         return 0 <= x < self.board_size_x and 0 <= y < self.board_size_y
 
     def is_slot_full(self, slot: int) -> bool:
-        for row in self.board:
-            if row[slot] == self.BOARD_EMPTY_SLOT:
-                return False
-        return True
+        return self.heights[slot] == self.board_size_x
 
     @property
     def is_board_full(self) -> bool:
-        return all(self.BOARD_EMPTY_SLOT not in row for row in self.board)
+        return self.moves_count == self.board_size_x * self.board_size_y
 
     def execute_move(self, player: str, slot: int) -> None:
-        for i in range(self.board_size_x):
-            if self.board[~i][slot] == '_':
-                self.board[~i][slot] = player
-                return
+        position: int = slot * self.slot_height + self.heights[slot]
+        self.history.append((player, slot, self.cached_winner))
+        self.masks[player] |= 1 << position
+        self.zobrist_hash ^= self.zobrist_keys[player][position]
+        self.heights[slot] += 1
+        self.moves_count += 1
+        if self.cached_winner is None and self.is_winning_move(self.masks[player], position):
+            self.cached_winner = player
 
     def play_move(self, slot: int) -> None:
         if not 0 <= slot < self.board_size_y:
@@ -97,6 +201,19 @@ class Connect:
             self.execute_move(self.HUMAN, slot)
         self.player_turn *= -1
 
+    def undo_move(self) -> int:
+        """Отменяет последний ход play_move и возвращает его слот."""
+        if not self.history:
+            raise EmptyHistoryError('There are no moves to undo!')
+        player, slot, self.cached_winner = self.history.pop()
+        self.heights[slot] -= 1
+        position: int = slot * self.slot_height + self.heights[slot]
+        self.masks[player] ^= 1 << position
+        self.zobrist_hash ^= self.zobrist_keys[player][position]
+        self.moves_count -= 1
+        self.player_turn *= -1
+        return slot
+
 
 if __name__ == '__main__':
     connect: Connect = Connect()
@@ -106,4 +223,4 @@ if __name__ == '__main__':
                      ['A', 'A', 'H', 'H'],
                      ['H', 'H', 'A', 'A'],
                      ['A', 'H', 'A', 'H']]
-    print(bool(connect))
\ No newline at end of file
+    print(bool(connect))
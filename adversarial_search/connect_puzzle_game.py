@@ -1,16 +1,44 @@
-from adversarial_search.connect_ai import minmax
-from adversarial_search.connect_puzzle import Connect, WrongInputError, SlotFullError
+from adversarial_search.connect_book import OpeningBook
+from adversarial_search.connect_mcts import MonteCarloTreeSearch
+from adversarial_search.connect_negamax import NegamaxSearch
+from adversarial_search.connect_parallel import ParallelSearch
+from adversarial_search.connect_puzzle import Connect, ConnectError, WrongInputError, SlotFullError
+from adversarial_search.connect_transposition import TranspositionTable
 
 
 class Game:
-    SEARCH_DEPTH: int = 10
+    SEARCH_DEPTH: int = 20
+    # Ответ AI за время не дольше этого (секунды) на доске любого размера
+    TIME_LIMIT: float = 1.0
+    TRANSPOSITION_TABLE_SIZE: int = 1 << 20
+    ALGORITHMS: tuple[str, ...] = ('negamax', 'mcts')
 
-    def __init__(self) -> None:
-        self.connect: Connect = Connect()
+    def __init__(self, board_size_x: int = 5, board_size_y: int = 4,
+                 winning_sequence_count: int | None = None, processes: int = 1, seed: int | None = None,
+                 book_path: str | None = None, algorithm: str = 'negamax') -> None:
+        if algorithm not in self.ALGORITHMS:
+            raise ConnectError(f'Unknown algorithm {algorithm!r}, expected one of {", ".join(self.ALGORITHMS)}!')
+        self.algorithm: str = algorithm
+        self.connect: Connect = Connect(board_size_x, board_size_y, winning_sequence_count)
+        # Таблица живёт всю партию: позиции из прошлых поисков переиспользуются на следующих ходах
+        self.transposition_table: TranspositionTable = TranspositionTable(self.TRANSPOSITION_TABLE_SIZE)
+        self.engine: NegamaxSearch = NegamaxSearch(self.transposition_table)
+        # Дерево MCTS тоже живёт всю партию и переиспользуется после ответа человека
+        self.mcts_engine: MonteCarloTreeSearch = MonteCarloTreeSearch(seed=seed)
+        self.book: OpeningBook | None = OpeningBook(book_path) if book_path else None
+        # Несколько процессов - поиск с разделением корня, иначе один поиск с общей таблицей
+        self.parallel_engine: ParallelSearch | None = ParallelSearch(processes, seed) if processes > 1 else None
 
     def turn_ai(self) -> None:
         print('Thinking...')
-        slot: int = minmax(self.connect, self.SEARCH_DEPTH).slot
+        if self.book is not None and (book_move := self.book.lookup(self.connect)):
+            slot: int = book_move.slot
+        elif self.algorithm == 'mcts':
+            slot = self.mcts_engine.search(self.connect, self.TIME_LIMIT).slot
+        elif self.parallel_engine is not None:
+            slot = self.parallel_engine.search(self.connect, self.SEARCH_DEPTH, self.TIME_LIMIT).slot
+        else:
+            slot = self.engine.iterative_deepening(self.connect, self.SEARCH_DEPTH, self.TIME_LIMIT).slot
         self.connect.play_move(slot)
 
     @staticmethod
@@ -36,6 +64,10 @@ class Game:
                 self.turn_human()
             print(self.connect)
         print(self.connect.winner or 'Draw!')
+        if self.parallel_engine is not None:
+            self.parallel_engine.close()
+        if self.book is not None:
+            self.book.close()
 
 
 def main():
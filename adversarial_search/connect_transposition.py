@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+class Bound(Enum):
+    EXACT = 'exact'
+    LOWER = 'lower'
+    UPPER = 'upper'
+
+
+@dataclass(frozen=True)
+class Entry:
+    key: int
+    depth: int
+    score: float
+    bound: Bound
+    slot: int
+
+
+class TranspositionTable:
+    """Таблица фиксированного размера: позиция попадает в ячейку key % size.
+        При коллизии политика 'depth' сохраняет более глубокий результат, 'always' - всегда новый."""
+    REPLACE_ALWAYS: str = 'always'
+    REPLACE_DEPTH: str = 'depth'
+    DEFAULT_SIZE: int = 1 << 20
+
+    def __init__(self, size: int = DEFAULT_SIZE, replacement: str = REPLACE_DEPTH) -> None:
+        if replacement not in (self.REPLACE_ALWAYS, self.REPLACE_DEPTH):
+            raise ValueError(f'Unknown replacement policy {replacement!r}!')
+        self.size: int = size
+        self.replacement: str = replacement
+        self.entries: list[Entry | None] = [None] * size
+        self.hits: int = 0
+        self.stores: int = 0
+
+    def __len__(self) -> int:
+        return sum(entry is not None for entry in self.entries)
+
+    def get(self, key: int) -> Entry | None:
+        entry: Entry | None = self.entries[key % self.size]
+        if entry is None or entry.key != key:
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, key: int, depth: int, score: float, bound: Bound, slot: int) -> None:
+        index: int = key % self.size
+        entry: Entry | None = self.entries[index]
+        if (self.replacement == self.REPLACE_DEPTH and entry is not None
+                and entry.key != key and entry.depth > depth):
+            return
+        self.entries[index] = Entry(key, depth, score, bound, slot)
+        self.stores += 1
+
+    def clear(self) -> None:
+        self.entries = [None] * self.size
+        self.hits = 0
+        self.stores = 0
@@ -0,0 +1,98 @@
+import time
+
+import numpy as np
+
+from ants.carnival_aco import (ALPHA, BETA, EVAPORATION_RATE, NUMBER_OF_ANTS_FACTOR, RANDOM_ATTRACTION_FACTOR,
+                               TOTAL_ITERATIONS, attraction_distances)
+
+
+class VectorizedACO:
+    """Муравьиный алгоритм на матрицах NumPy. eta = distance^-BETA считается один раз,
+        вес переходов tau^ALPHA * eta - один раз за итерацию. Все муравьи строят маршруты
+        одновременно: на каждом шаге строка весов из текущей достопримечательности каждого муравья
+        маскируется посещёнными, а следующая выбирается по кумулятивной сумме через searchsorted."""
+
+    def __init__(self, distances: list[list[int]] | np.ndarray, number_of_ants_factor: float = NUMBER_OF_ANTS_FACTOR,
+                 alpha: float = ALPHA, beta: float = BETA,
+                 random_attraction_factor: float = RANDOM_ATTRACTION_FACTOR, seed: int | None = None) -> None:
+        self.distances: np.ndarray = np.asarray(distances, dtype=np.float64)
+        self.attraction_count: int = len(self.distances)
+        self.number_of_ants: int = max(round(number_of_ants_factor * self.attraction_count), 1)
+        self.alpha: float = alpha
+        self.random_attraction_factor: float = random_attraction_factor
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        positive: np.ndarray = self.distances > 0
+        # Переход в саму себя (нулевое расстояние) получает нулевой вес
+        self.eta: np.ndarray = np.zeros_like(self.distances)
+        self.eta[positive] = self.distances[positive] ** -beta
+        self.pheromone_trails: np.ndarray = np.ones_like(self.distances)
+        # До первой итерации маршрута нет: пустой массив и бесконечная длина
+        self.best_distance: float = float('inf')
+        self.best_tour: np.ndarray = np.empty(0, dtype=np.int64)
+
+    def construct_tours(self, weights: np.ndarray) -> np.ndarray:
+        """Маршруты всех муравьёв: матрица (муравей, шаг) с номерами достопримечательностей."""
+        ants, count = self.number_of_ants, self.attraction_count
+        rows: np.ndarray = np.arange(ants)
+        tours: np.ndarray = np.empty((ants, count), dtype=np.int64)
+        tours[:, 0] = self.rng.integers(0, count, ants)
+        unvisited: np.ndarray = np.ones((ants, count), dtype=bool)
+        unvisited[rows, tours[:, 0]] = False
+
+        for step in range(1, count):
+            step_weights: np.ndarray = weights[tours[:, step - 1]] * unvisited
+            # Случайный ход или нулевые веса у всех оставшихся - равновероятный выбор из непосещённых
+            is_random: np.ndarray = self.rng.random(ants) < self.random_attraction_factor
+            is_random |= step_weights.sum(axis=1) <= 0
+            step_weights[is_random] = unvisited[is_random]
+
+            cumulative: np.ndarray = np.cumsum(step_weights, axis=1)
+            cumulative /= cumulative[:, -1:]
+            # Строки сдвигаются на свой номер, и один searchsorted по плоскому массиву выбирает во всех сразу
+            spins: np.ndarray = self.rng.random(ants) + rows
+            chosen: np.ndarray = np.searchsorted((cumulative + rows[:, None]).ravel(), spins, side='right')
+            chosen = np.minimum(chosen - rows * count, count - 1)
+            # Погрешность округления может указать на посещённую: берём самую весомую из оставшихся
+            is_wrong: np.ndarray = ~unvisited[rows, chosen]
+            if is_wrong.any():
+                chosen[is_wrong] = np.argmax(step_weights[is_wrong], axis=1)
+            tours[:, step] = chosen
+            unvisited[rows, chosen] = False
+        return tours
+
+    def get_distances(self, tours: np.ndarray) -> np.ndarray:
+        distances: np.ndarray = self.distances[tours[:, :-1], tours[:, 1:]].sum(axis=1)
+        return distances
+
+    def update_pheromones(self, tours: np.ndarray, distances: np.ndarray, evaporation: float) -> None:
+        self.pheromone_trails *= evaporation
+        fitness: np.ndarray = np.repeat(1 / distances, self.attraction_count - 1)
+        origins, targets = tours[:, :-1].ravel(), tours[:, 1:].ravel()
+        np.add.at(self.pheromone_trails, (origins, targets), fitness)
+        np.add.at(self.pheromone_trails, (targets, origins), fitness)
+
+    def __call__(self, total_iterations: int, evaporation: float, verbose: bool = False) -> tuple[np.ndarray, float]:
+        for iteration in range(total_iterations):
+            weights: np.ndarray = self.pheromone_trails ** self.alpha * self.eta
+            tours: np.ndarray = self.construct_tours(weights)
+            distances: np.ndarray = self.get_distances(tours)
+            self.update_pheromones(tours, distances, evaporation)
+
+            best: int = int(np.argmin(distances))
+            if distances[best] < self.best_distance:
+                self.best_distance, self.best_tour = float(distances[best]), tours[best].copy()
+            if verbose:
+                print(f'{iteration + 1} -> Best distance: {self.best_distance:.0f}')
+        return self.best_tour, self.best_distance
+
+
+def main() -> None:
+    start_time: float = time.perf_counter()
+    aco: VectorizedACO = VectorizedACO(attraction_distances, seed=42)
+    best_tour, best_distance = aco(TOTAL_ITERATIONS, EVAPORATION_RATE)
+    print(f'Best distance: {best_distance:.0f}, Time: {time.perf_counter() - start_time:.2f} s')
+    print('Best tour:', ' => '.join(map(str, best_tour)))
+
+
+if __name__ == '__main__':
+    main()
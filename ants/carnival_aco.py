@@ -1,4 +1,5 @@
 import csv
+import os
 import random
 
 ATTRACTION_COUNT: int = 48
@@ -6,7 +7,7 @@ RANDOM_ATTRACTION_FACTOR: float = 0.0
 ALPHA: int = 1
 BETA: int = 4
 
-file_name: str = f'attractions-{ATTRACTION_COUNT}.csv'
+file_name: str = os.path.join(os.path.dirname(__file__), f'attractions-{ATTRACTION_COUNT}.csv')
 with open(file_name) as file:
     attraction_distances: list[list[int]] = [list(map(int, row)) for row in csv.reader(file)]
 
@@ -133,5 +134,6 @@ NUMBER_OF_ANTS_FACTOR: float = 0.7
 TOTAL_ITERATIONS: int = 1000
 EVAPORATION_RATE: float = 0.9
 
-aco = ACO(NUMBER_OF_ANTS_FACTOR)
-aco(TOTAL_ITERATIONS, EVAPORATION_RATE)
+if __name__ == '__main__':
+    aco = ACO(NUMBER_OF_ANTS_FACTOR)
+    aco(TOTAL_ITERATIONS, EVAPORATION_RATE)
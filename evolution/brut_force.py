@@ -34,6 +34,7 @@ knapsack_items: list[list[str, int, int]] = [
 ]
 
 items: list[Item] = [Item(name, weight, price) for name, weight, price in knapsack_items]
+MAX_WEIGHT: int = 6404180
 
 
 def fitness_value(individual: list[int], max_weight: int) -> int:
@@ -54,7 +55,7 @@ def brute_force():
     bit_string_size: int = len(items)
     best_price: int = 0
     best_individual: list[int] = []
-    max_weight: int = 6404180
+    max_weight: int = MAX_WEIGHT
     for i, ind in enumerate(product([0, 1], repeat=bit_string_size)):
         price: int = fitness_value(ind, max_weight)
         if price > best_price:
@@ -67,7 +68,8 @@ def brute_force():
     print(best_individual)
 
 
-start_time: float = time.time()
-brute_force()
-end_time: float = time.time()
-print('total time:', end_time - start_time)
\ No newline at end of file
+if __name__ == '__main__':
+    start_time: float = time.time()
+    brute_force()
+    end_time: float = time.time()
+    print('total time:', end_time - start_time)
@@ -0,0 +1,143 @@
+import time
+
+import numpy as np
+
+from evolution.brut_force import MAX_WEIGHT, Item, items
+from evolution.knapsack_exact import Solution, make_solution
+
+
+class GeneticAlgorithm:
+    """Генетический алгоритм для битовых строк рюкзака. Популяция - матрица 0/1 (особь на строку),
+        вес и цена всей популяции - два произведения матрицы на вектор. Отбор турниром,
+        одноточечное скрещивание и мутация тоже считаются над всей матрицей сразу.
+        Перевес обрабатывается ремонтом (из набора выкидываются предметы с худшей ценой за вес,
+        пока он не влезет) или штрафом, пропорциональным перевесу."""
+    REPAIR: str = 'repair'
+    PENALTY: str = 'penalty'
+
+    def __init__(self, items: list[Item], max_weight: int, population_size: int = 200,
+                 crossover_rate: float = 0.9, mutation_rate: float | None = None, elite_count: int = 2,
+                 tournament_size: int = 3, constraint: str = REPAIR, patience: int = 50,
+                 max_generations: int = 1000, seed: int | None = None) -> None:
+        if constraint not in (self.REPAIR, self.PENALTY):
+            raise ValueError(f'Unknown constraint handling {constraint!r}!')
+        self.items: list[Item] = items
+        self.max_weight: int = max_weight
+        self.weights: np.ndarray = np.array([item.weight for item in items], dtype=np.int64)
+        self.prices: np.ndarray = np.array([item.price for item in items], dtype=np.int64)
+        # Порядок ремонта: сначала выкидываются предметы с худшей ценой за единицу веса
+        self.repair_order: np.ndarray = np.argsort(self.prices / np.maximum(self.weights, 1), kind='stable')
+        # Штраф за единицу перевеса дороже любой цены за единицу веса: перевес никогда не выгоден
+        self.penalty_factor: float = float((self.prices / np.maximum(self.weights, 1)).max(initial=0)) + 1
+        self.population_size: int = population_size + population_size % 2
+        self.crossover_rate: float = crossover_rate
+        self.mutation_rate: float = mutation_rate if mutation_rate is not None else 1 / max(len(items), 1)
+        self.elite_count: int = elite_count
+        self.tournament_size: int = tournament_size
+        self.constraint: str = constraint
+        self.patience: int = patience
+        self.max_generations: int = max_generations
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.population: np.ndarray = self.create_population(self.population_size)
+        self.generation: int = 0
+        self.best_price: int = -1
+        self.best_individual: np.ndarray = np.zeros(len(items), dtype=np.uint8)
+        self.history: list[int] = []
+
+    def create_population(self, size: int) -> np.ndarray:
+        # Вероятность гена такая, чтобы в среднем набор был около вместимости
+        total_weight: int = int(self.weights.sum())
+        probability: float = min(self.max_weight / total_weight, 1.0) if total_weight else 0.5
+        population: np.ndarray = (self.rng.random((size, len(self.items))) < probability).astype(np.uint8)
+        return self.repair(population) if self.constraint == self.REPAIR else population
+
+    def repair(self, population: np.ndarray) -> np.ndarray:
+        """Для каждой строки выкидывает худшие по цене за вес взятые предметы, пока их суммарный
+            вес меньше перевеса: кумулятивная сумма по строкам вместо цикла по особям."""
+        excess: np.ndarray = population @ self.weights - self.max_weight
+        overweight: np.ndarray = excess > 0
+        if not overweight.any():
+            return population
+        ordered: np.ndarray = population[overweight][:, self.repair_order]
+        dropped_weights: np.ndarray = ordered * self.weights[self.repair_order]
+        dropped_before: np.ndarray = np.cumsum(dropped_weights, axis=1) - dropped_weights
+        ordered[(dropped_before < excess[overweight, None]) & (ordered == 1)] = 0
+        repaired: np.ndarray = population.copy()
+        repaired[np.ix_(overweight, self.repair_order)] = ordered
+        return repaired
+
+    def evaluate(self, population: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Возвращает (приспособленность, вес, цена) всех особей."""
+        weights: np.ndarray = population @ self.weights
+        prices: np.ndarray = population @ self.prices
+        if self.constraint == self.PENALTY:
+            fitness: np.ndarray = prices - self.penalty_factor * np.maximum(weights - self.max_weight, 0)
+        else:
+            fitness = prices.astype(np.float64)
+        return fitness, weights, prices
+
+    def select(self, fitness: np.ndarray, count: int) -> np.ndarray:
+        contestants: np.ndarray = self.rng.integers(0, len(fitness), (count, self.tournament_size))
+        winners: np.ndarray = np.argmax(fitness[contestants], axis=1)
+        selected: np.ndarray = contestants[np.arange(count), winners]
+        return selected
+
+    def crossover(self, parents: np.ndarray) -> np.ndarray:
+        first, second = parents[0::2], parents[1::2]
+        points: np.ndarray = self.rng.integers(1, max(len(self.items), 2), len(first))
+        # Без скрещивания точка разреза в конце строки: дети - копии родителей
+        points[self.rng.random(len(first)) >= self.crossover_rate] = len(self.items)
+        head: np.ndarray = np.arange(len(self.items)) < points[:, None]
+        return np.concatenate((np.where(head, first, second), np.where(head, second, first)))
+
+    def mutate(self, population: np.ndarray) -> np.ndarray:
+        return population ^ (self.rng.random(population.shape) < self.mutation_rate).astype(np.uint8)
+
+    def update_best(self, fitness: np.ndarray, weights: np.ndarray, prices: np.ndarray) -> bool:
+        feasible_prices: np.ndarray = np.where(weights <= self.max_weight, prices, -1)
+        best: int = int(np.argmax(feasible_prices))
+        if feasible_prices[best] > self.best_price:
+            self.best_price = int(feasible_prices[best])
+            self.best_individual = self.population[best].copy()
+            return True
+        return False
+
+    def step(self) -> bool:
+        """Одно поколение. Возвращает True, если найден лучший допустимый набор."""
+        fitness, weights, prices = self.evaluate(self.population)
+        improved: bool = self.update_best(fitness, weights, prices)
+        elite: np.ndarray = self.population[np.argsort(fitness)[::-1][:self.elite_count]]
+
+        offspring_count: int = self.population_size - self.elite_count
+        parents: np.ndarray = self.population[self.select(fitness, offspring_count + offspring_count % 2)]
+        offspring: np.ndarray = self.mutate(self.crossover(parents))[:offspring_count]
+        if self.constraint == self.REPAIR:
+            offspring = self.repair(offspring)
+        self.population = np.concatenate((elite, offspring))
+        self.generation += 1
+        self.history.append(self.best_price)
+        return improved
+
+    def run(self) -> Solution:
+        """Останавливается через max_generations поколений или patience поколений без улучшения."""
+        stagnation: int = 0
+        while self.generation < self.max_generations and stagnation < self.patience:
+            stagnation = 0 if self.step() else stagnation + 1
+        self.update_best(*self.evaluate(self.population))
+        return make_solution(self.items, self.best_individual.tolist())
+
+
+def main() -> None:
+    for constraint in (GeneticAlgorithm.REPAIR, GeneticAlgorithm.PENALTY):
+        print(f'---Genetic Algorithm, {constraint}---')
+        start_time: float = time.perf_counter()
+        genetic_algorithm: GeneticAlgorithm = GeneticAlgorithm(items, MAX_WEIGHT, constraint=constraint, seed=42)
+        solution: Solution = genetic_algorithm.run()
+        elapsed: float = time.perf_counter() - start_time
+        print(f'Best score: {solution.price}, Weight: {solution.weight}, Generations: {genetic_algorithm.generation}, '
+              f'Time: {elapsed:.3f} s, {elapsed / max(genetic_algorithm.generation, 1) * 1e6:.0f} us/generation')
+        print('Best individual:', solution.individual)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import os
+import time
+from multiprocessing import Process, Queue
+from typing import Any, Callable
+
+import numpy as np
+
+from evolution.brut_force import MAX_WEIGHT, Item, items
+from evolution.genetic_algorithm import GeneticAlgorithm
+from evolution.knapsack_exact import Solution, make_solution
+
+Topology = Callable[[int, int], list[int]]
+
+TOPOLOGIES: dict[str, Topology] = {
+    'ring': lambda island, count: [(island + 1) % count] if count > 1 else [],
+    'bidirectional_ring': lambda island, count: sorted({(island - 1) % count, (island + 1) % count} - {island}),
+    'fully_connected': lambda island, count: [other for other in range(count) if other != island],
+}
+
+
+class Island:
+    """Популяция генетического алгоритма, которая обменивается лучшими особями с соседями."""
+
+    def __init__(self, index: int, items: list[Item], max_weight: int, seed: int | None, **options: Any) -> None:
+        self.index: int = index
+        # У каждого острова своё зерно, выведенное из общего: прогоны воспроизводимы, острова различны
+        island_seed: int | None = None
+        if seed is not None:
+            island_seed = int(np.random.SeedSequence([seed, index]).generate_state(1)[0])
+        self.genetic_algorithm: GeneticAlgorithm = GeneticAlgorithm(items, max_weight, seed=island_seed, **options)
+
+    def evolve(self, generations: int) -> None:
+        for _ in range(generations):
+            self.genetic_algorithm.step()
+
+    def get_migrants(self, count: int) -> np.ndarray:
+        fitness, _, _ = self.genetic_algorithm.evaluate(self.genetic_algorithm.population)
+        return self.genetic_algorithm.population[np.argsort(fitness, kind='stable')[::-1][:count]].copy()
+
+    def receive(self, migrants: list[np.ndarray]) -> None:
+        """Мигранты заменяют худших особей популяции."""
+        if not migrants:
+            return
+        arrivals: np.ndarray = np.concatenate(migrants)
+        population: np.ndarray = self.genetic_algorithm.population
+        fitness, _, _ = self.genetic_algorithm.evaluate(population)
+        worst: np.ndarray = np.argsort(fitness, kind='stable')[:len(arrivals)]
+        population[worst] = arrivals[:len(worst)]
+
+    def get_result(self) -> tuple[int, list[int]]:
+        genetic_algorithm: GeneticAlgorithm = self.genetic_algorithm
+        genetic_algorithm.update_best(*genetic_algorithm.evaluate(genetic_algorithm.population))
+        return genetic_algorithm.best_price, genetic_algorithm.best_individual.tolist()
+
+
+def get_sources(topology: Topology, island: int, count: int) -> list[int]:
+    return [source for source in range(count) if island in topology(source, count)]
+
+
+def run_island(island: Island, topology_name: str, count: int, epochs: int, migration_interval: int,
+               migrant_count: int, inboxes: list[Queue], results: Queue) -> None:
+    """Процесс острова. Миграция синхронная: остров ждёт мигрантов от всех источников этой эпохи
+        и принимает их в порядке номеров источников, поэтому результат не зависит от планировщика.
+        Топология передаётся по имени: lambda не пиклится при запуске процессов через spawn."""
+    topology: Topology = TOPOLOGIES[topology_name]
+    sources: list[int] = get_sources(topology, island.index, count)
+    # Быстрый сосед может прислать мигрантов следующей эпохи раньше, чем медленный - текущей
+    pending: dict[tuple[int, int], np.ndarray] = {}
+    for epoch in range(epochs):
+        island.evolve(migration_interval)
+        if epoch == epochs - 1:
+            break
+        migrants: np.ndarray = island.get_migrants(migrant_count)
+        for destination in topology(island.index, count):
+            inboxes[destination].put((epoch, island.index, migrants))
+        while any((epoch, source) not in pending for source in sources):
+            message_epoch, source, source_migrants = inboxes[island.index].get()
+            pending[message_epoch, source] = source_migrants
+        island.receive([pending.pop((epoch, source)) for source in sources])
+    results.put((island.index, *island.get_result()))
+
+
+def run_islands(items: list[Item], max_weight: int, island_count: int | None = None, topology: str = 'ring',
+                migration_interval: int = 20, migrant_count: int = 2, generations: int = 400,
+                seed: int | None = None, processes: bool = True, **options: Any) -> Solution:
+    """Островная модель: island_count популяций (по умолчанию по числу ядер) эволюционируют
+        в отдельных процессах и каждые migration_interval поколений отправляют migrant_count
+        лучших особей соседям по топологии. options передаются в GeneticAlgorithm каждого острова.
+        processes=False выполняет те же острова по очереди в одном процессе с тем же результатом."""
+    if topology not in TOPOLOGIES:
+        raise ValueError(f'Unknown topology {topology!r}, expected one of {", ".join(TOPOLOGIES)}!')
+    count: int = island_count or os.cpu_count() or 1
+    links: Topology = TOPOLOGIES[topology]
+    epochs: int = max(-(-generations // migration_interval), 1)
+    islands: list[Island] = [Island(index, items, max_weight, seed, **options) for index in range(count)]
+
+    if processes:
+        inboxes: list[Queue] = [Queue() for _ in range(count)]
+        results_queue: Queue = Queue()
+        workers: list[Process] = [Process(target=run_island, args=(island, topology, count, epochs, migration_interval,
+                                                                   migrant_count, inboxes, results_queue))
+                                  for island in islands]
+        for worker in workers:
+            worker.start()
+        results: list[tuple[int, int, list[int]]] = [results_queue.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+    else:
+        for epoch in range(epochs):
+            for island in islands:
+                island.evolve(migration_interval)
+            if epoch == epochs - 1:
+                break
+            migrants: list[np.ndarray] = [island.get_migrants(migrant_count) for island in islands]
+            for island in islands:
+                island.receive([migrants[source] for source in get_sources(links, island.index, count)])
+        results = [(island.index, *island.get_result()) for island in islands]
+
+    _, _, individual = max(results, key=lambda result: (result[1], -result[0]))
+    return make_solution(items, individual)
+
+
+def main() -> None:
+    print('---Island Model Genetic Algorithm---')
+    start_time: float = time.perf_counter()
+    solution: Solution = run_islands(items, MAX_WEIGHT, island_count=4, seed=42, population_size=100)
+    print(f'Best score: {solution.price}, Weight: {solution.weight}, Time: {time.perf_counter() - start_time:.2f} s')
+    print('Best individual:', solution.individual)
+
+
+if __name__ == '__main__':
+    main()
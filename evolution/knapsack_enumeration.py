@@ -0,0 +1,154 @@
+import os
+import time
+from bisect import bisect_right
+from multiprocessing import Pool
+from typing import Any, Callable, Iterator
+
+from evolution.brut_force import MAX_WEIGHT, Item, items
+from evolution.knapsack_exact import Solution, make_solution
+
+# Таблица половины предметов для meet-in-the-middle: веса по возрастанию,
+# лучшая цена среди наборов не тяжелее каждого веса и маска этого набора
+HalfTable = tuple[list[int], list[int], list[int]]
+
+worker_items: list[Item] = []
+worker_max_weight: int = 0
+worker_table: HalfTable | None = None
+
+
+def iterate_gray_code(items: list[Item], start: int = 0, stop: int | None = None) -> Iterator[tuple[int, int, int]]:
+    """Обходит наборы в порядке кода Грея: соседние наборы отличаются одним предметом,
+        поэтому вес и цена обновляются одним сложением. Номера start..stop позволяют делить
+        перебор на куски. Отдаёт (маска набора, вес, цена)."""
+    stop = 1 << len(items) if stop is None else stop
+    mask: int = start ^ (start >> 1)
+    weight: int = sum(item.weight for i, item in enumerate(items) if mask >> i & 1)
+    price: int = sum(item.price for i, item in enumerate(items) if mask >> i & 1)
+    if start < stop:
+        yield mask, weight, price
+    for k in range(start + 1, stop):
+        # Между кодами k - 1 и k меняется младший единичный бит числа k
+        bit: int = (k & -k).bit_length() - 1
+        item: Item = items[bit]
+        mask ^= 1 << bit
+        if mask >> bit & 1:
+            weight += item.weight
+            price += item.price
+        else:
+            weight -= item.weight
+            price -= item.price
+        yield mask, weight, price
+
+
+def get_individual(mask: int, size: int) -> list[int]:
+    return [mask >> i & 1 for i in range(size)]
+
+
+def split_range(size: int, chunk_count: int) -> list[tuple[int, int]]:
+    step: int = -(-size // chunk_count)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def init_worker(items: list[Item], max_weight: int, table: HalfTable | None = None) -> None:
+    global worker_items, worker_max_weight, worker_table
+    worker_items, worker_max_weight, worker_table = items, max_weight, table
+
+
+def search_gray_code_chunk(chunk: tuple[int, int]) -> tuple[int, list[int]]:
+    """Лучшая цена в куске перебора и маски всех наборов с этой ценой."""
+    best_price: int = -1
+    best_masks: list[int] = []
+    for mask, weight, price in iterate_gray_code(worker_items, *chunk):
+        if weight <= worker_max_weight and price >= best_price:
+            if price > best_price:
+                best_price, best_masks = price, []
+            best_masks.append(mask)
+    return best_price, best_masks
+
+
+def run_chunks(function: Callable[[tuple[int, int]], Any], chunks: list[tuple[int, int]], items: list[Item],
+               max_weight: int, table: HalfTable | None, processes: int | None) -> list[Any]:
+    if processes == 1:
+        init_worker(items, max_weight, table)
+        return [function(chunk) for chunk in chunks]
+    with Pool(processes or os.cpu_count(), initializer=init_worker, initargs=(items, max_weight, table)) as pool:
+        return pool.map(function, chunks, chunksize=1)
+
+
+def solve_gray_code(items: list[Item], max_weight: int, processes: int | None = None,
+                    chunk_count: int | None = None) -> list[Solution]:
+    """Полный перебор 2^n наборов кусками в пуле процессов. Возвращает все оптимальные наборы."""
+    chunk_count = chunk_count or 4 * (processes or os.cpu_count() or 1)
+    chunks: list[tuple[int, int]] = split_range(1 << len(items), chunk_count)
+    results: list[tuple[int, list[int]]] = run_chunks(search_gray_code_chunk, chunks, items, max_weight,
+                                                      None, processes)
+    best_price: int = max(price for price, _ in results)
+    return [make_solution(items, get_individual(mask, len(items)))
+            for price, masks in results if price == best_price for mask in masks]
+
+
+def build_half_table(items: list[Item]) -> HalfTable:
+    """Все 2^k сумм половины предметов удвоением списка: номер суммы и есть маска набора."""
+    weights: list[int] = [0]
+    prices: list[int] = [0]
+    for item in items:
+        weights += [weight + item.weight for weight in weights]
+        prices += [price + item.price for price in prices]
+    order: list[int] = sorted(range(len(weights)), key=weights.__getitem__)
+
+    sorted_weights: list[int] = []
+    best_prices: list[int] = []
+    best_masks: list[int] = []
+    best_price, best_mask = -1, 0
+    for mask in order:
+        if prices[mask] > best_price:
+            best_price, best_mask = prices[mask], mask
+        sorted_weights.append(weights[mask])
+        best_prices.append(best_price)
+        best_masks.append(best_mask)
+    return sorted_weights, best_prices, best_masks
+
+
+def search_half_chunk(chunk: tuple[int, int]) -> tuple[int, int]:
+    """Для каждого набора первой половины в куске лучшая пара из второй половины
+        находится двоичным поиском по остатку вместимости. Возвращает (цена, общая маска)."""
+    if worker_table is None:
+        raise ValueError('Worker was not initialised with a half table!')
+    sorted_weights, best_prices, best_masks = worker_table
+    first_size: int = len(worker_items) // 2
+    best_price, best_mask = -1, 0
+    for mask, weight, price in iterate_gray_code(worker_items[:first_size], *chunk):
+        if weight > worker_max_weight:
+            continue
+        index: int = bisect_right(sorted_weights, worker_max_weight - weight) - 1
+        if price + best_prices[index] > best_price:
+            best_price, best_mask = price + best_prices[index], mask | best_masks[index] << first_size
+    return best_price, best_mask
+
+
+def solve_meet_in_the_middle(items: list[Item], max_weight: int, processes: int | None = None,
+                             chunk_count: int | None = None) -> Solution:
+    """O(2^(n/2) * n) вместо O(2^n): суммы второй половины сортируются один раз,
+        наборы первой половины перебираются кусками в пуле процессов."""
+    first_size: int = len(items) // 2
+    table: HalfTable = build_half_table(items[first_size:])
+    chunk_count = chunk_count or 4 * (processes or os.cpu_count() or 1)
+    chunks: list[tuple[int, int]] = split_range(1 << first_size, chunk_count)
+    results: list[tuple[int, int]] = run_chunks(search_half_chunk, chunks, items, max_weight, table, processes)
+    _, best_mask = max(results)
+    return make_solution(items, get_individual(best_mask, len(items)))
+
+
+def main() -> None:
+    for title, solve in (('---Meet in the Middle---', lambda: solve_meet_in_the_middle(items, MAX_WEIGHT)),
+                         ('---Gray Code Enumeration---', lambda: solve_gray_code(items, MAX_WEIGHT)[0])):
+        print(title)
+        start_time: float = time.perf_counter()
+        solution: Solution = solve()
+        print(f'Best score: {solution.price}, Weight: {solution.weight}, '
+              f'Time: {time.perf_counter() - start_time:.2f} s')
+        print('Best individual:', solution.individual)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import math
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate
+
+from evolution.brut_force import MAX_WEIGHT, Item, items
+
+Solution = namedtuple('Solution', 'price weight individual')
+
+
+def make_solution(items: list[Item], individual: list[int]) -> Solution:
+    weight: int = sum(item.weight for item, gene in zip(items, individual) if gene)
+    price: int = sum(item.price for item, gene in zip(items, individual) if gene)
+    return Solution(price, weight, individual)
+
+
+def solve_branch_and_bound(items: list[Item], max_weight: int) -> Solution:
+    """Поиск в глубину по предметам, отсортированным по цене за единицу веса.
+        Верхняя граница ветки - дробная релаксация: добираем предметы по порядку и часть
+        первого не влезшего. С префиксными суммами граница считается двоичным поиском."""
+    order: list[int] = sorted(range(len(items)), reverse=True,
+                              key=lambda i: items[i].price / items[i].weight if items[i].weight else math.inf)
+    weights: list[int] = [items[i].weight for i in order]
+    prices: list[int] = [items[i].price for i in order]
+    prefix_weights: list[int] = list(accumulate(weights, initial=0))
+    prefix_prices: list[int] = list(accumulate(prices, initial=0))
+    count: int = len(order)
+
+    def get_upper_bound(index: int, capacity: int, price: int) -> int:
+        limit: int = prefix_weights[index] + capacity
+        last: int = bisect_right(prefix_weights, limit) - 1
+        bound: float = price + prefix_prices[last] - prefix_prices[index]
+        if last < count:
+            bound += (limit - prefix_weights[last]) * prices[last] / weights[last]
+        # Цены целые, поэтому дробную часть границы можно отбросить
+        return int(bound)
+
+    taken: list[int] = [0] * count
+    best_price: int = -1
+    best_taken: list[int] = taken.copy()
+
+    def branch(index: int, capacity: int, price: int) -> None:
+        nonlocal best_price, best_taken
+        if price > best_price:
+            best_price, best_taken = price, taken.copy()
+        if index == count or get_upper_bound(index, capacity, price) <= best_price:
+            return
+        if weights[index] <= capacity:
+            taken[index] = 1
+            branch(index + 1, capacity - weights[index], price + prices[index])
+            taken[index] = 0
+        branch(index + 1, capacity, price)
+
+    branch(0, max_weight, 0)
+    individual: list[int] = [0] * count
+    for position, i in enumerate(order):
+        individual[i] = best_taken[position]
+    return make_solution(items, individual)
+
+
+def solve_dynamic(items: list[Item], max_weight: int, scale: int | None = None) -> Solution:
+    """Динамика по вместимости: лучшая цена для каждого веса от 0 до max_weight / scale,
+        время и память O(len(items) * max_weight / scale). По умолчанию scale - НОД всех весов
+        и вместимости, тогда решение точное. Больший scale огрубляет задачу: веса округляются вверх,
+        вместимость вниз, поэтому набор всегда допустим, но может быть не оптимален."""
+    if scale is None:
+        scale = math.gcd(max_weight, *(item.weight for item in items)) or 1
+    capacity: int = max_weight // scale
+    best_prices: list[int] = [0] * (capacity + 1)
+    # taken[i][c] - предмет i взят в лучшем наборе вместимости c среди первых i + 1 предметов
+    taken: list[bytearray] = []
+    for item in items:
+        weight: int = -(-item.weight // scale)
+        item_taken: bytearray = bytearray(capacity + 1)
+        for c in range(capacity, weight - 1, -1):
+            price: int = best_prices[c - weight] + item.price
+            if price > best_prices[c]:
+                best_prices[c] = price
+                item_taken[c] = 1
+        taken.append(item_taken)
+
+    individual: list[int] = [0] * len(items)
+    c = capacity
+    for i in reversed(range(len(items))):
+        if taken[i][c]:
+            individual[i] = 1
+            c -= -(-items[i].weight // scale)
+    return make_solution(items, individual)
+
+
+def main() -> None:
+    for title, solve in (('---Branch and Bound---', lambda: solve_branch_and_bound(items, MAX_WEIGHT)),
+                         ('---Dynamic Programming, weights scaled by 1000---',
+                          lambda: solve_dynamic(items, MAX_WEIGHT, 1000))):
+        print(title)
+        start_time: float = time.perf_counter()
+        solution: Solution = solve()
+        print(f'Best score: {solution.price}, Weight: {solution.weight}, '
+              f'Time: {(time.perf_counter() - start_time) * 1000:.1f} ms')
+        print('Best individual:', solution.individual)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tracemalloc
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Callable
+
+from search.maze_astar import run_astar, run_dijkstra
+from search.maze_bfs import run_bfs
+from search.maze_bidirectional import run_bidirectional_astar, run_bidirectional_bfs
+from search.maze_dfs import run_dfs
+from search.maze_distance_field import DistanceField
+from search.maze_dstar_lite import DStarLite
+from search.maze_goals import find_nearest_goal
+from search.maze_hpa import HierarchicalMaze
+from search.maze_ida import run_ida_star, run_iddfs
+from search.maze_jps import run_jps
+from search.maze_puzzle import CostMove, MazePuzzle, Point
+from search.maze_stats import SearchStats
+
+Algorithm = Callable[[MazePuzzle, Point, SearchStats], Point | None]
+# Предобработка лабиринта, после которой запросы дешёвые: её время меряется отдельно от запроса
+Builder = Callable[[MazePuzzle], Algorithm]
+
+# IDA* и IDDFS при недостижимой цели перебирают все простые пути,
+# поэтому их ограничивают кратным стоимости и длины пути из угла в угол
+SEARCH_LIMIT_FACTOR: int = 2
+
+
+def get_max_cost(maze_puzzle: MazePuzzle) -> float:
+    return SEARCH_LIMIT_FACTOR * (maze_puzzle.height * CostMove.STANDARD.value
+                                  + maze_puzzle.width * CostMove.GRAVITY.value)
+
+
+def get_max_depth(maze_puzzle: MazePuzzle) -> int:
+    return SEARCH_LIMIT_FACTOR * (maze_puzzle.height + maze_puzzle.width)
+
+
+def run_dstar_lite(maze_puzzle: MazePuzzle, current_point: Point, stats: SearchStats) -> Point | None:
+    planner: DStarLite = DStarLite(maze_puzzle, current_point)
+    try:
+        return planner.find_path(stats)
+    finally:
+        planner.close()
+
+
+def build_hpa(maze_puzzle: MazePuzzle) -> Algorithm:
+    hierarchical_maze: HierarchicalMaze = HierarchicalMaze(maze_puzzle)
+    return lambda _, point, stats: hierarchical_maze.find_path(point)
+
+
+def build_distance_field(maze_puzzle: MazePuzzle) -> Algorithm:
+    distance_field: DistanceField = DistanceField(maze_puzzle)
+    return lambda _, point, stats: distance_field.get_goal_point(point)
+
+
+ALGORITHMS: dict[str, Algorithm] = {
+    'bfs': lambda maze_puzzle, point, stats: run_bfs(maze_puzzle, point, stats=stats),
+    'dfs': lambda maze_puzzle, point, stats: run_dfs(maze_puzzle, point, stats=stats),
+    'astar': lambda maze_puzzle, point, stats: run_astar(maze_puzzle, point, stats=stats),
+    'dijkstra': lambda maze_puzzle, point, stats: run_dijkstra(maze_puzzle, point, stats=stats),
+    'nearest_goal': lambda maze_puzzle, point, stats: find_nearest_goal(maze_puzzle, point, stats),
+    'bidirectional_bfs': lambda maze_puzzle, point, stats: run_bidirectional_bfs(maze_puzzle, point, stats=stats),
+    'bidirectional_astar': lambda maze_puzzle, point, stats: run_bidirectional_astar(maze_puzzle, point,
+                                                                                      stats=stats),
+    'jps': lambda maze_puzzle, point, stats: run_jps(maze_puzzle, point, stats=stats),
+    'ida_star': lambda maze_puzzle, point, stats: run_ida_star(maze_puzzle, point, cache_size=maze_puzzle.size,
+                                                               max_cost=get_max_cost(maze_puzzle), stats=stats),
+    'iddfs': lambda maze_puzzle, point, stats: run_iddfs(maze_puzzle, point, get_max_depth(maze_puzzle),
+                                                         cache_size=maze_puzzle.size, stats=stats),
+    'dstar_lite': run_dstar_lite,
+}
+
+BUILDERS: dict[str, Builder] = {
+    'hpa': build_hpa,
+    'distance_field': build_distance_field,
+}
+
+# Эти алгоритмы не заполняют SearchStats: для них в таблице вместо счётчиков '-'
+UNCOUNTED_ALGORITHMS: set[str] = {*BUILDERS}
+
+# Итерации IDA* и IDDFS заново проходят уже пройденное: на лабиринтах 100x100 и больше
+# прогон идёт минутами, поэтому по умолчанию они не запускаются, только через --algorithms
+SLOW_ALGORITHMS: set[str] = {'ida_star', 'iddfs'}
+DEFAULT_ALGORITHMS: list[str] = [algorithm for algorithm in [*ALGORITHMS, *BUILDERS]
+                                 if algorithm not in SLOW_ALGORITHMS]
+
+
+@dataclass
+class BenchmarkResult:
+    algorithm: str
+    size: int
+    density: float
+    seed: int
+    found: bool
+    path_length: int
+    path_cost: float
+    expanded_cells: int | None
+    peak_frontier: int | None
+    visited_cells: int | None
+    # Время предобработки (только для BUILDERS) и время самого запроса
+    build_time: float | None
+    wall_time: float
+    expansions_per_second: float | None
+    peak_memory: int
+
+
+def generate_maze(size: int, density: float, seed: int) -> tuple[MazePuzzle, Point]:
+    """Квадратный лабиринт со стенами с вероятностью density, целью в углу (0, 0)
+        и стартом в противоположном углу. Случайная монотонная тропа от старта к цели
+        гарантирует, что путь существует. Один и тот же seed даёт один и тот же лабиринт."""
+    randomizer: random.Random = random.Random(seed)
+    wall: int = ord(MazePuzzle.WALL)
+    empty: int = ord(MazePuzzle.EMPTY)
+    grid: bytearray = bytearray(wall if randomizer.random() < density else empty for _ in range(size * size))
+    x, y = size - 1, size - 1
+    while x or y:
+        grid[x * size + y] = empty
+        if y == 0 or (x and randomizer.random() < 0.5):
+            x -= 1
+        else:
+            y -= 1
+    grid[0] = ord(MazePuzzle.GOAL)
+    return MazePuzzle.from_grid(grid, size, size), Point(size - 1, size - 1)
+
+
+def run_benchmark(algorithm: str, size: int, density: float, seed: int,
+                  measure_memory: bool = True) -> BenchmarkResult:
+    maze_puzzle, starting_point = generate_maze(size, density, seed)
+
+    build_time: float | None = None
+    started_at: float = perf_counter()
+    run: Algorithm = BUILDERS[algorithm](maze_puzzle) if algorithm in BUILDERS else ALGORITHMS[algorithm]
+    if algorithm in BUILDERS:
+        build_time = perf_counter() - started_at
+
+    stats: SearchStats = SearchStats()
+    started_at = perf_counter()
+    outcome: Point | None = run(maze_puzzle, starting_point, stats)
+    wall_time: float = perf_counter() - started_at
+
+    peak_memory: int = 0
+    if measure_memory:
+        # Отдельный прогон: tracemalloc заметно замедляет выполнение и исказил бы время.
+        # Для BUILDERS память считается вместе с предобработкой
+        tracemalloc.start()
+        run = BUILDERS[algorithm](maze_puzzle) if algorithm in BUILDERS else run
+        run(maze_puzzle, starting_point, SearchStats())
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    path_length, path_cost = 0, 0.0
+    if outcome:
+        _, path_length, path_cost = maze_puzzle.get_path(outcome)
+    counted: bool = algorithm not in UNCOUNTED_ALGORITHMS
+    return BenchmarkResult(algorithm=algorithm, size=size, density=density, seed=seed, found=outcome is not None,
+                           path_length=path_length, path_cost=path_cost,
+                           expanded_cells=stats.expanded_cells if counted else None,
+                           peak_frontier=stats.peak_frontier if counted else None,
+                           visited_cells=stats.visited_cells if counted else None,
+                           build_time=build_time, wall_time=wall_time,
+                           expansions_per_second=stats.expansions_per_second if counted else None,
+                           peak_memory=peak_memory)
+
+
+def format_value(value: float | None, width: int, precision: int = 0) -> str:
+    return f'{"-":>{width}}' if value is None else f'{value:>{width}.{precision}f}'
+
+
+def run_suite(algorithms: list[str], sizes: list[int], densities: list[float], seed: int,
+              measure_memory: bool = True) -> list[BenchmarkResult]:
+    results: list[BenchmarkResult] = []
+    print(f'{"algorithm":<20}{"size":>6}{"density":>9}{"cost":>10}{"expanded":>10}{"frontier":>10}'
+          f'{"build, s":>10}{"time, s":>10}{"expanded/s":>12}{"memory, KB":>12}')
+    for size in sizes:
+        for density in densities:
+            for algorithm in algorithms:
+                result: BenchmarkResult = run_benchmark(algorithm, size, density, seed, measure_memory)
+                results.append(result)
+                print(f'{result.algorithm:<20}{result.size:>6}{result.density:>9.2f}'
+                      f'{format_value(result.path_cost if result.found else None, 10)}'
+                      f'{format_value(result.expanded_cells, 10)}{format_value(result.peak_frontier, 10)}'
+                      f'{format_value(result.build_time, 10, 3)}{result.wall_time:>10.3f}'
+                      f'{format_value(result.expansions_per_second, 12)}{result.peak_memory // 1024:>12}')
+    return results
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Maze search benchmark')
+    parser.add_argument('--algorithms', nargs='+', choices=[*ALGORITHMS, *BUILDERS], default=DEFAULT_ALGORITHMS,
+                        help=f'default: all but {", ".join(sorted(SLOW_ALGORITHMS))}, which take minutes '
+                             f'from size 100 on; run them on small sizes')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 200, 400])
+    parser.add_argument('--densities', nargs='+', type=float, default=[0.1, 0.2, 0.3])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', help='write results as JSON for regression comparison')
+    args: argparse.Namespace = parser.parse_args()
+
+    results: list[BenchmarkResult] = run_suite(args.algorithms, args.sizes, args.densities, args.seed,
+                                               not args.no_memory)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,87 @@
 import heapq
-from search.maze_puzzle import MazePuzzle, Point
+from array import array
+from typing import Callable
 
+from search.maze_puzzle import CostMove, MazePuzzle, Point
+from search.maze_stats import SearchStats
 
-def run_astar(maze_puzzle: MazePuzzle, current_point: Point) -> Point | None:
-    queue: list[Point] = [current_point]
-    visited_points: set[Point] = set()
+Heuristic = Callable[[int], float]
+
+
+def make_manhattan_heuristic(maze_puzzle: MazePuzzle, goal_cells: list[int] | None = None) -> Heuristic:
+    """Манхэттенское расстояние до ближайшей цели, где шаг по y стоит CostMove.GRAVITY,
+        а шаг по x - CostMove.STANDARD. Допустима и монотонна для стоимостей MazePuzzle."""
+    width: int = maze_puzzle.width
+    goals: list[tuple[int, int]] = [divmod(cell, width)
+                                    for cell in (maze_puzzle.goal_cells if goal_cells is None else goal_cells)]
+    cost_x: int = CostMove.STANDARD.value
+    cost_y: int = CostMove.GRAVITY.value
+
+    if len(goals) == 1:
+        (goal_x, goal_y), = goals
+
+        def heuristic(cell: int) -> float:
+            x, y = divmod(cell, width)
+            return abs(x - goal_x) * cost_x + abs(y - goal_y) * cost_y
+    else:
+        def heuristic(cell: int) -> float:
+            x, y = divmod(cell, width)
+            return min((abs(x - goal_x) * cost_x + abs(y - goal_y) * cost_y for goal_x, goal_y in goals),
+                       default=0)
+
+    return heuristic
+
+
+def zero_heuristic(cell: int) -> float:
+    return 0
+
+
+def run_astar(maze_puzzle: MazePuzzle, current_point: Point, heuristic: Heuristic | None = None,
+              goal_point: Point | None = None, stats: SearchStats | None = None) -> Point | None:
+    if stats is not None:
+        stats.start()
+    # Без goal_point целью считается любая клетка GOAL лабиринта
+    goal_cell: int = -1 if goal_point is None else maze_puzzle.get_cell(goal_point.x, goal_point.y)
+    if heuristic is None:
+        heuristic = make_manhattan_heuristic(maze_puzzle, None if goal_point is None else [goal_cell])
+
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    g_scores: array = array('d', [float('inf')]) * maze_puzzle.size
+    g_scores[start_cell] = 0
+    parents: array = maze_puzzle.new_parents()
+    closed_cells: bytearray = bytearray(maze_puzzle.size)
+    # (f, -g, cell): при равных f раньше раскрываем более глубокие клетки
+    queue: list[tuple[float, float, int]] = [(heuristic(start_cell), 0, start_cell)]
+    outcome: Point | None = None
     while queue:
-        current_point = heapq.heappop(queue)
-        if current_point not in visited_points:
-            visited_points.add(current_point)
+        _, negative_g, current_cell = heapq.heappop(queue)
+        if closed_cells[current_cell] or -negative_g > g_scores[current_cell]:
+            continue  # устаревшая запись (ленивый decrease-key)
+        closed_cells[current_cell] = 1
+        if stats is not None:
+            stats.expand(len(queue) + 1)
+
+        if current_cell == goal_cell or (goal_cell == -1 and maze_puzzle.cell_is_goal(current_cell)):
+            outcome = maze_puzzle.build_point_chain(current_cell, parents)
+            break
+
+        current_g: float = g_scores[current_cell]
+        for neighbor in maze_puzzle.get_neighbor_cells(current_cell):
+            if closed_cells[neighbor]:
+                continue
+            g: float = current_g + maze_puzzle.get_move_cost_cells(current_cell, neighbor)
+            if g < g_scores[neighbor]:
+                g_scores[neighbor] = g
+                parents[neighbor] = current_cell
+                heapq.heappush(queue, (g + heuristic(neighbor), -g, neighbor))
 
-            if maze_puzzle.point_is_goal(current_point):
-                return current_point
+    if stats is not None:
+        stats.finish(closed_cells.count(1))
+    return outcome
 
-            neighbors: list[Point] = maze_puzzle.get_neighbors(current_point)
-            for neighbor in neighbors:
-                neighbor.parent = current_point
-                neighbor.cost = maze_puzzle.determine_cost(current_point, neighbor)
-                heapq.heappush(queue, neighbor)
 
-    return None
+def run_dijkstra(maze_puzzle: MazePuzzle, current_point: Point, stats: SearchStats | None = None) -> Point | None:
+    return run_astar(maze_puzzle, current_point, zero_heuristic, stats=stats)
 
 
 def main() -> None:
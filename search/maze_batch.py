@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterator
+
+from search.maze_astar import run_astar
+from search.maze_bidirectional import run_bidirectional_astar, run_bidirectional_bfs
+from search.maze_puzzle import MazeError, MazePuzzle, Point
+
+Solver = Callable[..., Point | None]
+Query = tuple[Point, Point | None]
+PathResult = tuple[list[Point], int, float]
+
+
+def run_astar_to_goal(maze_puzzle: MazePuzzle, current_point: Point, goal_point: Point | None) -> Point | None:
+    return run_astar(maze_puzzle, current_point, goal_point=goal_point)
+
+
+SOLVERS: dict[str, Solver] = {
+    'astar': run_astar_to_goal,
+    'bidirectional_astar': run_bidirectional_astar,
+    'bidirectional_bfs': run_bidirectional_bfs,
+}
+
+worker_memory: SharedMemory | None = None
+worker_maze: MazePuzzle | None = None
+worker_solver: Solver | None = None
+
+
+def init_worker(memory_name: str, height: int, width: int, algorithm: str) -> None:
+    """Процесс пула подключается к разделяемой памяти и строит лабиринт прямо поверх неё, без копии
+        сетки, задачи передают только координаты. Память открыта до конца процесса. Лабиринт
+        в процессе только для чтения: update_cells бросает MazeError, менять лабиринт нужно
+        в родителе и запускать новый run_batch."""
+    global worker_memory, worker_maze, worker_solver
+    worker_memory = SharedMemory(name=memory_name)
+    buffer: memoryview | None = worker_memory.buf
+    if buffer is None:
+        raise MazeError(f'Shared memory {memory_name!r} is closed!')
+    worker_maze = MazePuzzle.from_shared_buffer(buffer, height, width)
+    worker_solver = SOLVERS[algorithm]
+
+
+def solve_query(task: tuple[int, tuple[int, int], tuple[int, int] | None]) -> tuple[int, list[int] | None]:
+    index, (start_x, start_y), goal = task
+    if worker_maze is None or worker_solver is None:
+        raise MazeError('Worker was not initialised with a maze!')
+    goal_point: Point | None = None if goal is None else Point(*goal)
+    outcome: Point | None = worker_solver(worker_maze, Point(start_x, start_y), goal_point)
+    if outcome is None:
+        return index, None
+    # Возвращаем клетки, а не цепочку Point: длинные цепочки parent плохо пиклятся
+    cells: list[int] = []
+    point: Point | None = outcome
+    while point:
+        cells.append(worker_maze.get_cell(point.x, point.y))
+        point = point.parent
+    return index, cells
+
+
+def restore_path(maze_puzzle: MazePuzzle, cells: list[int]) -> PathResult:
+    point: Point = maze_puzzle.get_point(cells[-1])
+    for cell in reversed(cells[:-1]):
+        next_point: Point = maze_puzzle.get_point(cell)
+        next_point.parent = point
+        point = next_point
+    return maze_puzzle.get_path(point)
+
+
+def run_batch(maze_puzzle: MazePuzzle, queries: list[Query], algorithm: str = 'astar',
+              processes: int | None = None, chunk_size: int = 16) -> Iterator[tuple[int, PathResult | None]]:
+    """Решает пары (старт, цель) в пуле процессов. Цель None - ближайшая клетка GOAL.
+        Результаты отдаются по мере готовности как (индекс запроса, результат get_path или None).
+        Алгоритм проверяется сразу при вызове, а не при первом next() у генератора."""
+    if algorithm not in SOLVERS:
+        raise MazeError(f'Unknown algorithm {algorithm!r}, expected one of {", ".join(SOLVERS)}!')
+    return iterate_batch(maze_puzzle, queries, algorithm, processes, chunk_size)
+
+
+def iterate_batch(maze_puzzle: MazePuzzle, queries: list[Query], algorithm: str, processes: int | None,
+                  chunk_size: int) -> Iterator[tuple[int, PathResult | None]]:
+    # Рядом с сеткой лежит и проходимость клеток, чтобы процессы не строили свою копию
+    shared_memory: SharedMemory = SharedMemory(create=True, size=2 * maze_puzzle.size)
+    try:
+        buffer: memoryview | None = shared_memory.buf
+        if buffer is None:
+            raise MazeError(f'Shared memory {shared_memory.name!r} is closed!')
+        buffer[:maze_puzzle.size] = maze_puzzle.grid
+        buffer[maze_puzzle.size:2 * maze_puzzle.size] = maze_puzzle.passable
+        tasks: Iterator[tuple[int, tuple[int, int], tuple[int, int] | None]] = (
+            (index, (start.x, start.y), None if goal is None else (goal.x, goal.y))
+            for index, (start, goal) in enumerate(queries))
+        with Pool(processes or os.cpu_count(), initializer=init_worker,
+                  initargs=(shared_memory.name, maze_puzzle.height, maze_puzzle.width, algorithm)) as pool:
+            for index, cells in pool.imap_unordered(solve_query, tasks, chunksize=chunk_size):
+                yield index, None if cells is None else restore_path(maze_puzzle, cells)
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def main() -> None:
+    print('---Batch A-* Search---')
+    maze_puzzle: MazePuzzle = MazePuzzle()
+    queries: list[Query] = [(Point(2, 2), None), (Point(4, 4), None), (Point(2, 2), Point(0, 4))]
+
+    for index, result in sorted(run_batch(maze_puzzle, queries, processes=2), key=lambda item: item[0]):
+        if result:
+            path, length, cost = result
+            print(f'Query {index}: Path Length: {length}, Path Cost: {cost}')
+            print(' => '.join(map(str, path[::-1])))
+
+
+if __name__ == '__main__':
+    main()
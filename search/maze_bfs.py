@@ -1,23 +1,36 @@
+from array import array
 from collections import deque
 
 from search.maze_puzzle import MazePuzzle, Point
-
-
-def run_bfs(maze_puzzle: MazePuzzle, current_point: Point) -> Point | None:
-    queue: deque[Point] = deque([current_point])
-    visited_points: set[Point] = {current_point}
-    while queue:
-        current_point = queue.popleft()
-        neighbors: list[Point] = maze_puzzle.get_neighbors(current_point)
-        for neighbor in neighbors:
-            if neighbor not in visited_points:
-                neighbor.parent = current_point
+from search.maze_stats import SearchStats
+
+
+def run_bfs(maze_puzzle: MazePuzzle, current_point: Point, stats: SearchStats | None = None) -> Point | None:
+    if stats is not None:
+        stats.start()
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    queue: deque[int] = deque([start_cell])
+    parents: array = maze_puzzle.new_parents()
+    visited_cells: bytearray = bytearray(maze_puzzle.size)
+    visited_cells[start_cell] = 1
+    outcome: Point | None = None
+    while queue and outcome is None:
+        current_cell: int = queue.popleft()
+        if stats is not None:
+            stats.expand(len(queue) + 1)
+        for neighbor in maze_puzzle.get_neighbor_cells(current_cell):
+            if not visited_cells[neighbor]:
+                parents[neighbor] = current_cell
                 queue.append(neighbor)
-                visited_points.add(neighbor)
+                visited_cells[neighbor] = 1
+
+                if maze_puzzle.cell_is_goal(neighbor):
+                    outcome = maze_puzzle.build_point_chain(neighbor, parents)
+                    break
 
-                if maze_puzzle.point_is_goal(neighbor):
-                    return neighbor
-    return None
+    if stats is not None:
+        stats.finish(visited_cells.count(1))
+    return outcome
 
 
 def main() -> None:
@@ -0,0 +1,165 @@
+import heapq
+from array import array
+
+from search.maze_astar import Heuristic, make_manhattan_heuristic
+from search.maze_puzzle import MazePuzzle, Point
+from search.maze_stats import SearchStats
+
+
+def get_target_cells(maze_puzzle: MazePuzzle, goal_point: Point | None) -> list[int]:
+    if goal_point is None:
+        return maze_puzzle.goal_cells
+    return [maze_puzzle.get_cell(goal_point.x, goal_point.y)]
+
+
+def join_paths(maze_puzzle: MazePuzzle, forward_parents: array, backward_parents: array,
+               meet_from: int, meet_to: int) -> Point:
+    """Склеивает прямое дерево (до meet_from) с обратным (от meet_to до цели) в одну цепочку Point."""
+    if meet_from != -1:
+        forward_parents[meet_to] = meet_from
+    cell: int = meet_to
+    next_cell: int = backward_parents[cell]
+    while next_cell != -1:
+        forward_parents[next_cell] = cell
+        cell, next_cell = next_cell, backward_parents[next_cell]
+    return maze_puzzle.build_point_chain(cell, forward_parents)
+
+
+def run_bidirectional_bfs(maze_puzzle: MazePuzzle, current_point: Point, goal_point: Point | None = None,
+                          stats: SearchStats | None = None) -> Point | None:
+    if stats is not None:
+        stats.start()
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    target_cells: list[int] = get_target_cells(maze_puzzle, goal_point)
+    if not target_cells:
+        if stats is not None:
+            stats.finish(0)
+        return None
+
+    parents: tuple[array, array] = (maze_puzzle.new_parents(), maze_puzzle.new_parents())
+    depths: tuple[array, array] = (array('i', [-1]) * maze_puzzle.size, array('i', [-1]) * maze_puzzle.size)
+    frontiers: tuple[list[int], list[int]] = ([start_cell], target_cells)
+    depths[0][start_cell] = 0
+    for cell in target_cells:
+        depths[1][cell] = 0
+    outcome: Point | None = maze_puzzle.get_point(start_cell) if depths[1][start_cell] == 0 else None
+
+    while outcome is None and frontiers[0] and frontiers[1]:
+        side: int = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own_depths, other_depths = depths[side], depths[1 - side]
+        own_parents: array = parents[side]
+        best_length: int = -1
+        best_edge: tuple[int, int] = (-1, -1)
+        next_frontier: list[int] = []
+        for cell in frontiers[side]:
+            if stats is not None:
+                stats.expand(len(frontiers[0]) + len(frontiers[1]) + len(next_frontier))
+            depth: int = own_depths[cell] + 1
+            for neighbor in maze_puzzle.get_neighbor_cells(cell):
+                if other_depths[neighbor] != -1:
+                    length: int = depth + other_depths[neighbor]
+                    if best_length == -1 or length < best_length:
+                        best_length, best_edge = length, (cell, neighbor)
+                if own_depths[neighbor] == -1:
+                    own_depths[neighbor] = depth
+                    own_parents[neighbor] = cell
+                    next_frontier.append(neighbor)
+
+        if best_length != -1:
+            meet_from, meet_to = best_edge if side == 0 else best_edge[::-1]
+            outcome = join_paths(maze_puzzle, parents[0], parents[1], meet_from, meet_to)
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+    if stats is not None:
+        stats.finish(sum(1 for forward, backward in zip(*depths) if forward != -1 or backward != -1))
+    return outcome
+
+
+def run_bidirectional_astar(maze_puzzle: MazePuzzle, current_point: Point, goal_point: Point | None = None,
+                            stats: SearchStats | None = None) -> Point | None:
+    if stats is not None:
+        stats.start()
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    target_cells: list[int] = get_target_cells(maze_puzzle, goal_point)
+    if not target_cells:
+        if stats is not None:
+            stats.finish(0)
+        return None
+
+    infinity: float = float('inf')
+    heuristics: tuple[Heuristic, Heuristic] = (make_manhattan_heuristic(maze_puzzle, target_cells),
+                                               make_manhattan_heuristic(maze_puzzle, [start_cell]))
+    g_scores: tuple[array, array] = (array('d', [infinity]) * maze_puzzle.size,
+                                     array('d', [infinity]) * maze_puzzle.size)
+    parents: tuple[array, array] = (maze_puzzle.new_parents(), maze_puzzle.new_parents())
+    closed_cells: tuple[bytearray, bytearray] = (bytearray(maze_puzzle.size), bytearray(maze_puzzle.size))
+    queues: tuple[list[tuple[float, float, int]], list[tuple[float, float, int]]] = ([], [])
+
+    g_scores[0][start_cell] = 0
+    queues[0].append((heuristics[0](start_cell), 0, start_cell))
+    for cell in target_cells:
+        g_scores[1][cell] = 0
+        queues[1].append((heuristics[1](cell), 0, cell))
+    heapq.heapify(queues[1])
+    if g_scores[1][start_cell] == 0:
+        if stats is not None:
+            stats.finish(1)
+        return maze_puzzle.get_point(start_cell)
+
+    best_cost: float = infinity
+    best_edge: tuple[int, int] = (-1, -1)
+    while queues[0] and queues[1]:
+        # Для монотонной эвристики путь дешевле best_cost уже невозможен
+        if max(queues[0][0][0], queues[1][0][0]) >= best_cost:
+            break
+
+        side: int = 0 if len(queues[0]) <= len(queues[1]) else 1
+        queue: list[tuple[float, float, int]] = queues[side]
+        own_g, other_g = g_scores[side], g_scores[1 - side]
+        own_parents: array = parents[side]
+        own_closed: bytearray = closed_cells[side]
+        heuristic: Heuristic = heuristics[side]
+
+        _, negative_g, current_cell = heapq.heappop(queue)
+        if own_closed[current_cell] or -negative_g > own_g[current_cell]:
+            continue
+        own_closed[current_cell] = 1
+        if stats is not None:
+            stats.expand(len(queues[0]) + len(queues[1]) + 1)
+
+        current_g: float = own_g[current_cell]
+        for neighbor in maze_puzzle.get_neighbor_cells(current_cell):
+            g: float = current_g + maze_puzzle.get_move_cost_cells(current_cell, neighbor)
+            if g + other_g[neighbor] < best_cost:
+                best_cost = g + other_g[neighbor]
+                best_edge = (current_cell, neighbor) if side == 0 else (neighbor, current_cell)
+            if not own_closed[neighbor] and g < own_g[neighbor]:
+                own_g[neighbor] = g
+                own_parents[neighbor] = current_cell
+                heapq.heappush(queue, (g + heuristic(neighbor), -g, neighbor))
+
+    if stats is not None:
+        stats.finish(sum(1 for forward, backward in zip(*closed_cells) if forward or backward))
+    if best_cost == infinity:
+        return None
+    meet_from, meet_to = best_edge
+    return join_paths(maze_puzzle, parents[0], parents[1], meet_from, meet_to)
+
+
+def main() -> None:
+    maze_puzzle: MazePuzzle = MazePuzzle()
+    starting_point: Point = Point(2, 2)
+    for title, run in (('---Bidirectional Breadth-first Search---', run_bidirectional_bfs),
+                       ('---Bidirectional A-* Search---', run_bidirectional_astar)):
+        print(title)
+        outcome: Point | None = run(maze_puzzle, starting_point)
+        if outcome:
+            path, length, cost = maze_puzzle.get_path(outcome)
+            print(f'Path Length: {length}')
+            print(f'Path Cost: {cost}')
+            print(' => '.join(map(str, path[::-1])))
+            print(maze_puzzle.overlay_points_on_map(path))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,36 @@
+from array import array
+
 from search.maze_puzzle import MazePuzzle, Point
+from search.maze_stats import SearchStats
 
 
-def run_dfs(maze_puzzle: MazePuzzle, current_point: Point) -> Point | None:
-    stack: list[Point] = [current_point]
-    visited_points: set[Point] = set()
+def run_dfs(maze_puzzle: MazePuzzle, current_point: Point, stats: SearchStats | None = None) -> Point | None:
+    if stats is not None:
+        stats.start()
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    stack: list[tuple[int, int]] = [(start_cell, -1)]
+    parents: array = maze_puzzle.new_parents()
+    visited_cells: bytearray = bytearray(maze_puzzle.size)
+    outcome: Point | None = None
     while stack:
-        current_point = stack.pop()
-        if current_point not in visited_points:
-            visited_points.add(current_point)
-
-            if maze_puzzle.point_is_goal(current_point):
-                return current_point
-
-            neighbors: list[Point] = maze_puzzle.get_neighbors(current_point)
-            for neighbor in neighbors:
-                neighbor.parent = current_point
-                stack.append(neighbor)
-
-    return None
+        current_cell, parent = stack.pop()
+        if not visited_cells[current_cell]:
+            visited_cells[current_cell] = 1
+            parents[current_cell] = parent
+            if stats is not None:
+                stats.expand(len(stack) + 1)
+
+            if maze_puzzle.cell_is_goal(current_cell):
+                outcome = maze_puzzle.build_point_chain(current_cell, parents)
+                break
+
+            for neighbor in maze_puzzle.get_neighbor_cells(current_cell):
+                if not visited_cells[neighbor]:
+                    stack.append((neighbor, current_cell))
+
+    if stats is not None:
+        stats.finish(visited_cells.count(1))
+    return outcome
 
 
 def main() -> None:
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import OrderedDict
+
+from search.maze_puzzle import MazeError, MazePuzzle, Point
+
+
+class StaleDistanceFieldError(MazeError):
+    ...
+
+
+class DistanceField:
+    """Поле расстояний: обратная Дейкстра от всех целей, посчитанная один раз.
+        Хранится только массив int32 стоимостей до ближайшей цели (-1 - цель недостижима),
+        следующий шаг пути восстанавливается по соседям, поэтому запрос стоит O(длины пути)."""
+    UNREACHABLE: int = -1
+
+    def __init__(self, maze_puzzle: MazePuzzle, goal_cells: list[int] | None = None) -> None:
+        self.maze_puzzle: MazePuzzle = maze_puzzle
+        self.version: int = maze_puzzle.version
+        self.goal_cells: list[int] = maze_puzzle.goal_cells if goal_cells is None else goal_cells
+        self.distances: array = self.compute_distances()
+
+    def compute_distances(self) -> array:
+        maze_puzzle: MazePuzzle = self.maze_puzzle
+        distances: array = array('i', [self.UNREACHABLE]) * maze_puzzle.size
+        queue: list[tuple[int, int]] = []
+        for cell in self.goal_cells:
+            distances[cell] = 0
+            queue.append((0, cell))
+        heapq.heapify(queue)
+        while queue:
+            distance, current_cell = heapq.heappop(queue)
+            if distance > distances[current_cell]:
+                continue
+            for neighbor in maze_puzzle.get_neighbor_cells(current_cell):
+                new_distance: int = distance + maze_puzzle.get_move_cost_cells(current_cell, neighbor)
+                if distances[neighbor] == self.UNREACHABLE or new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    heapq.heappush(queue, (new_distance, neighbor))
+        return distances
+
+    @property
+    def is_valid(self) -> bool:
+        return self.version == self.maze_puzzle.version
+
+    def check_valid(self) -> None:
+        if not self.is_valid:
+            raise StaleDistanceFieldError('The maze has changed since the distance field was computed!')
+
+    def get_cost(self, point: Point) -> int | None:
+        self.check_valid()
+        distance: int = self.distances[self.maze_puzzle.get_cell(point.x, point.y)]
+        return None if distance == self.UNREACHABLE else distance
+
+    def get_next_cell(self, cell: int) -> int:
+        distance: int = self.distances[cell]
+        for neighbor in self.maze_puzzle.get_neighbor_cells(cell):
+            if self.distances[neighbor] == distance - self.maze_puzzle.get_move_cost_cells(cell, neighbor):
+                return neighbor
+        raise MazeError('Distance field is inconsistent with the maze!')
+
+    def get_goal_point(self, current_point: Point) -> Point | None:
+        """Возвращает цель с цепочкой parent до current_point, как run_bfs/run_astar."""
+        self.check_valid()
+        cell: int = self.maze_puzzle.get_cell(current_point.x, current_point.y)
+        if self.distances[cell] == self.UNREACHABLE:
+            return None
+
+        point: Point = self.maze_puzzle.get_point(cell)
+        while self.distances[cell] != 0:
+            cell = self.get_next_cell(cell)
+            next_point: Point = self.maze_puzzle.get_point(cell)
+            next_point.parent = point
+            point = next_point
+        return point
+
+
+class DistanceFieldCache:
+    """LRU-кэш полей расстояний по ключу (лабиринт, версия лабиринта, цели).
+        Подписывается на изменения лабиринта и сразу выбрасывает его устаревшие поля."""
+
+    def __init__(self, max_size: int = 8) -> None:
+        self.max_size: int = max_size
+        self.fields: OrderedDict[tuple[int, int, tuple[int, ...]], DistanceField] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def get(self, maze_puzzle: MazePuzzle, goal_points: list[Point] | None = None) -> DistanceField:
+        goal_cells: tuple[int, ...] = tuple(maze_puzzle.goal_cells) if goal_points is None \
+            else tuple(sorted({maze_puzzle.get_cell(point.x, point.y) for point in goal_points}))
+        key: tuple[int, int, tuple[int, ...]] = (id(maze_puzzle), maze_puzzle.version, goal_cells)
+        if key in self.fields:
+            self.fields.move_to_end(key)
+            return self.fields[key]
+
+        if self.invalidate not in maze_puzzle.change_listeners:
+            maze_puzzle.add_change_listener(self.invalidate)
+
+        distance_field: DistanceField = DistanceField(maze_puzzle, list(goal_cells))
+        self.fields[key] = distance_field
+        while len(self.fields) > self.max_size:
+            self.fields.popitem(last=False)
+        return distance_field
+
+    def invalidate(self, maze_puzzle: MazePuzzle, changed_cells: list[int] | None = None) -> None:
+        for key in [key for key in self.fields if key[0] == id(maze_puzzle)]:
+            del self.fields[key]
+
+    def clear(self) -> None:
+        self.fields.clear()
+
+
+distance_field_cache: DistanceFieldCache = DistanceFieldCache()
+
+
+def run_distance_field(maze_puzzle: MazePuzzle, current_point: Point,
+                       cache: DistanceFieldCache = distance_field_cache) -> Point | None:
+    return cache.get(maze_puzzle).get_goal_point(current_point)
+
+
+def main() -> None:
+    print('---Distance Field---')
+    maze_puzzle: MazePuzzle = MazePuzzle()
+
+    for starting_point in (Point(2, 2), Point(4, 4), Point(0, 4)):
+        outcome: Point | None = run_distance_field(maze_puzzle, starting_point)
+        if outcome:
+            path, length, cost = maze_puzzle.get_path(outcome)
+            print(f'Start: {starting_point}, Path Length: {length}, Path Cost: {cost}')
+            print(maze_puzzle.overlay_points_on_map(path))
+
+
+if __name__ == '__main__':
+    main()
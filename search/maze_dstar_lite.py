@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+
+from search.maze_puzzle import CostMove, MazePuzzle, Point
+from search.maze_stats import SearchStats
+
+
+class DStarLite:
+    """D* Lite: поиск ведётся от целей к старту, поэтому после изменения клеток
+        пересчитываются только вершины, чьи стоимости действительно поменялись.
+        Планировщик подписывается на изменения MazePuzzle, так что чинить дерево поиска
+        можно как через update_cells планировщика, так и напрямую через лабиринт."""
+    INFINITY: float = float('inf')
+
+    def __init__(self, maze_puzzle: MazePuzzle, start_point: Point) -> None:
+        self.maze_puzzle: MazePuzzle = maze_puzzle
+        self.start_cell: int = maze_puzzle.get_cell(start_point.x, start_point.y)
+        self.last_cell: int = self.start_cell
+        self.km: float = 0
+        self.g_scores: array = array('d', [self.INFINITY]) * maze_puzzle.size
+        self.rhs_scores: array = array('d', [self.INFINITY]) * maze_puzzle.size
+        self.queue: list[tuple[float, float, int]] = []
+        self.queued_keys: dict[int, tuple[float, float]] = {}
+        self.expanded_cells: int = 0
+
+        for cell in maze_puzzle.goal_cells:
+            self.rhs_scores[cell] = 0
+            self.push(cell)
+        maze_puzzle.add_change_listener(self.on_cells_changed)
+
+    def close(self) -> None:
+        self.maze_puzzle.remove_change_listener(self.on_cells_changed)
+
+    def get_heuristic(self, cell: int) -> float:
+        width: int = self.maze_puzzle.width
+        x, y = divmod(cell, width)
+        start_x, start_y = divmod(self.start_cell, width)
+        return abs(x - start_x) * CostMove.STANDARD.value + abs(y - start_y) * CostMove.GRAVITY.value
+
+    def calculate_key(self, cell: int) -> tuple[float, float]:
+        g: float = min(self.g_scores[cell], self.rhs_scores[cell])
+        return g + self.get_heuristic(cell) + self.km, g
+
+    def push(self, cell: int) -> None:
+        key: tuple[float, float] = self.calculate_key(cell)
+        self.queued_keys[cell] = key
+        heapq.heappush(self.queue, (key[0], key[1], cell))
+
+    def top(self) -> tuple[float, float, int] | None:
+        # Записи с устаревшим ключом или уже удалённых вершин пропускаются лениво
+        while self.queue:
+            k1, k2, cell = self.queue[0]
+            if self.queued_keys.get(cell) == (k1, k2):
+                return k1, k2, cell
+            heapq.heappop(self.queue)
+        return None
+
+    def get_adjacent_cells(self, cell: int) -> list[int]:
+        width: int = self.maze_puzzle.width
+        y: int = cell % width
+        cells: list[int] = []
+        if y + 1 < width:
+            cells.append(cell + 1)
+        if y > 0:
+            cells.append(cell - 1)
+        if cell + width < self.maze_puzzle.size:
+            cells.append(cell + width)
+        if cell >= width:
+            cells.append(cell - width)
+        return cells
+
+    def update_vertex(self, cell: int) -> None:
+        maze_puzzle: MazePuzzle = self.maze_puzzle
+        if maze_puzzle.cell_is_goal(cell) and maze_puzzle.passable[cell]:
+            self.rhs_scores[cell] = 0
+        elif not maze_puzzle.passable[cell]:
+            self.rhs_scores[cell] = self.INFINITY
+        else:
+            self.rhs_scores[cell] = min((maze_puzzle.get_move_cost_cells(cell, neighbor) + self.g_scores[neighbor]
+                                         for neighbor in maze_puzzle.get_neighbor_cells(cell)),
+                                        default=self.INFINITY)
+
+        self.queued_keys.pop(cell, None)
+        if self.g_scores[cell] != self.rhs_scores[cell]:
+            self.push(cell)
+
+    def compute_shortest_path(self, stats: SearchStats | None = None) -> None:
+        """stats считает раскрытия только этого пересчёта, а не накопленные expanded_cells."""
+        if stats is not None:
+            stats.start()
+        start_cell: int = self.start_cell
+        while (top := self.top()) is not None and \
+                ((top[0], top[1]) < self.calculate_key(start_cell)
+                 or self.rhs_scores[start_cell] != self.g_scores[start_cell]):
+            k1, k2, cell = top
+            new_key: tuple[float, float] = self.calculate_key(cell)
+            if (k1, k2) < new_key:
+                self.push(cell)
+                continue
+
+            heapq.heappop(self.queue)
+            del self.queued_keys[cell]
+            self.expanded_cells += 1
+            if stats is not None:
+                stats.expand(len(self.queued_keys) + 1)
+            if self.g_scores[cell] > self.rhs_scores[cell]:
+                self.g_scores[cell] = self.rhs_scores[cell]
+                for neighbor in self.maze_puzzle.get_neighbor_cells(cell):
+                    self.update_vertex(neighbor)
+            else:
+                self.g_scores[cell] = self.INFINITY
+                self.update_vertex(cell)
+                for neighbor in self.maze_puzzle.get_neighbor_cells(cell):
+                    self.update_vertex(neighbor)
+        if stats is not None:
+            stats.finish(sum(1 for g in self.g_scores if g != self.INFINITY))
+
+    def on_cells_changed(self, maze_puzzle: MazePuzzle, changed_cells: list[int]) -> None:
+        for cell in changed_cells:
+            self.update_vertex(cell)
+            for neighbor in self.get_adjacent_cells(cell):
+                self.update_vertex(neighbor)
+
+    def update_cells(self, changes: dict[Point, str]) -> list[int]:
+        return self.maze_puzzle.update_cells(changes)
+
+    def move_start(self, start_point: Point) -> None:
+        self.start_cell = self.maze_puzzle.get_cell(start_point.x, start_point.y)
+        self.km += self.get_heuristic(self.last_cell)
+        self.last_cell = self.start_cell
+
+    def get_next_cell(self, cell: int) -> int:
+        return min(self.maze_puzzle.get_neighbor_cells(cell),
+                   key=lambda neighbor: self.maze_puzzle.get_move_cost_cells(cell, neighbor) + self.g_scores[neighbor])
+
+    def find_path(self, stats: SearchStats | None = None) -> Point | None:
+        self.compute_shortest_path(stats)
+        maze_puzzle: MazePuzzle = self.maze_puzzle
+        cell: int = self.start_cell
+        if self.g_scores[cell] == self.INFINITY or not maze_puzzle.passable[cell]:
+            return None
+
+        point: Point = maze_puzzle.get_point(cell)
+        while not maze_puzzle.cell_is_goal(cell):
+            cell = self.get_next_cell(cell)
+            next_point: Point = maze_puzzle.get_point(cell)
+            next_point.parent = point
+            point = next_point
+        return point
+
+
+def main() -> None:
+    print('---D* Lite---')
+    maze_puzzle: MazePuzzle = MazePuzzle()
+    planner: DStarLite = DStarLite(maze_puzzle, Point(2, 2))
+
+    for changes in ({}, {Point(4, 1): MazePuzzle.WALL}, {Point(1, 4): MazePuzzle.GOAL}):
+        planner.update_cells(changes)
+        outcome: Point | None = planner.find_path()
+        if outcome:
+            path, length, cost = maze_puzzle.get_path(outcome)
+            print(f'Path Length: {length}, Path Cost: {cost}, Expanded: {planner.expanded_cells}')
+            print(maze_puzzle.overlay_points_on_map(path))
+
+
+if __name__ == '__main__':
+    main()
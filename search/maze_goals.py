@@ -0,0 +1,65 @@
+import heapq
+from array import array
+
+from search.maze_astar import run_astar
+from search.maze_puzzle import MazePuzzle, Point
+from search.maze_stats import SearchStats
+
+
+def find_nearest_goal(maze_puzzle: MazePuzzle, current_point: Point,
+                      stats: SearchStats | None = None) -> Point | None:
+    # Эвристика run_astar по умолчанию - минимум по всем целям, поэтому первая же
+    # закрытая цель является ближайшей по стоимости пути
+    return run_astar(maze_puzzle, current_point, stats=stats)
+
+
+def find_all_goals(maze_puzzle: MazePuzzle, current_point: Point,
+                   goal_points: list[Point] | None = None) -> dict[Point, Point]:
+    """Одним проходом Дейкстры находит кратчайшие пути ко всем целям.
+        Возвращает словарь цель -> цепочка Point, пригодная для MazePuzzle.get_path."""
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    goal_cells: set[int] = set(maze_puzzle.goal_cells) if goal_points is None \
+        else {maze_puzzle.get_cell(point.x, point.y) for point in goal_points}
+
+    g_scores: array = array('d', [float('inf')]) * maze_puzzle.size
+    g_scores[start_cell] = 0
+    parents: array = maze_puzzle.new_parents()
+    closed_cells: bytearray = bytearray(maze_puzzle.size)
+    queue: list[tuple[float, int]] = [(0, start_cell)]
+    found_cells: list[int] = []
+    while queue and len(found_cells) < len(goal_cells):
+        current_g, current_cell = heapq.heappop(queue)
+        if closed_cells[current_cell] or current_g > g_scores[current_cell]:
+            continue
+        closed_cells[current_cell] = 1
+
+        if current_cell in goal_cells:
+            found_cells.append(current_cell)
+
+        for neighbor in maze_puzzle.get_neighbor_cells(current_cell):
+            g: float = current_g + maze_puzzle.get_move_cost_cells(current_cell, neighbor)
+            if not closed_cells[neighbor] and g < g_scores[neighbor]:
+                g_scores[neighbor] = g
+                parents[neighbor] = current_cell
+                heapq.heappush(queue, (g, neighbor))
+
+    return {maze_puzzle.get_point(cell): maze_puzzle.build_point_chain(cell, parents) for cell in found_cells}
+
+
+def main() -> None:
+    print('---All goals (Dijkstra)---')
+    maze_puzzle: MazePuzzle = MazePuzzle(['*000*',
+                                          '0###0',
+                                          '0#0#0',
+                                          '0#000',
+                                          '0000*'])
+    starting_point: Point = Point(2, 2)
+
+    for goal, outcome in find_all_goals(maze_puzzle, starting_point).items():
+        path, length, cost = maze_puzzle.get_path(outcome)
+        print(f'Goal: {goal}, Path Length: {length}, Path Cost: {cost}')
+        print(maze_puzzle.overlay_points_on_map(path))
+
+
+if __name__ == '__main__':
+    main()
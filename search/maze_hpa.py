@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import heapq
+import struct
+import zlib
+from array import array
+from itertools import chain, islice
+from pathlib import Path
+from typing import Iterator
+
+from search.maze_astar import Heuristic, make_manhattan_heuristic
+from search.maze_puzzle import CellBuffer, CostMove, MazeError, MazeFormatError, MazePuzzle, Point
+
+
+class HierarchicalMaze:
+    """HPA*: лабиринт делится на кластеры cluster_size x cluster_size.
+        На общих границах кластеров выбираются входы (середина короткого прохода или оба конца
+        длинного), внутри кластера заранее считаются стоимости между входами по правилам CostMove.
+        Запрос сначала ищет путь по абстрактному графу входов, а клетки между входами
+        восстанавливаются лениво и только внутри одного кластера.
+        Путь почти оптимален: внутрикластерные отрезки не выходят за границы кластера."""
+    ENTRANCE_THRESHOLD: int = 6
+
+    FILE_MAGIC: bytes = b'HPA1'
+    FILE_HEADER: struct.Struct = struct.Struct('<4sIIIIII')  # magic, height, width, cluster, crc, nodes, edges
+
+    def __init__(self, maze_puzzle: MazePuzzle, cluster_size: int = 16, build: bool = True) -> None:
+        if cluster_size < 2:
+            raise MazeError('Cluster size must be at least 2!')
+        self.maze_puzzle: MazePuzzle = maze_puzzle
+        self.cluster_size: int = cluster_size
+        self.version: int = maze_puzzle.version
+        self.edges: dict[int, dict[int, int]] = {}
+        self.cluster_nodes: dict[tuple[int, int], set[int]] = {}
+        if build:
+            self.build()
+
+    @property
+    def is_valid(self) -> bool:
+        return self.version == self.maze_puzzle.version
+
+    def get_cluster(self, cell: int) -> tuple[int, int]:
+        x, y = divmod(cell, self.maze_puzzle.width)
+        return x // self.cluster_size, y // self.cluster_size
+
+    def get_cluster_bounds(self, cell: int) -> tuple[int, int, int, int]:
+        cluster_x, cluster_y = self.get_cluster(cell)
+        x0, y0 = cluster_x * self.cluster_size, cluster_y * self.cluster_size
+        return (x0, min(x0 + self.cluster_size, self.maze_puzzle.height),
+                y0, min(y0 + self.cluster_size, self.maze_puzzle.width))
+
+    def add_edge(self, origin: int, target: int, cost: int) -> None:
+        neighbors: dict[int, int] = self.edges.setdefault(origin, {})
+        if cost < neighbors.get(target, cost + 1):
+            neighbors[target] = cost
+
+    def build(self) -> None:
+        self.edges = {}
+        self.version = self.maze_puzzle.version
+        for cell in self.maze_puzzle.goal_cells:
+            self.edges.setdefault(cell, {})
+        self.build_entrances()
+        self.build_intra_edges()
+
+    def build_entrances(self) -> None:
+        maze_puzzle: MazePuzzle = self.maze_puzzle
+        passable: CellBuffer = maze_puzzle.passable
+        width: int = maze_puzzle.width
+        # Границы между кластерами по x: клетки (x, y) и (x + 1, y)
+        for x in range(self.cluster_size - 1, maze_puzzle.height - 1, self.cluster_size):
+            for y0 in range(0, width, self.cluster_size):
+                cells: list[int] = [x * width + y for y in range(y0, min(y0 + self.cluster_size, width))]
+                self.add_entrances(cells, width, passable)
+        # Границы между кластерами по y: клетки (x, y) и (x, y + 1)
+        for y in range(self.cluster_size - 1, width - 1, self.cluster_size):
+            for x0 in range(0, maze_puzzle.height, self.cluster_size):
+                cells = [x * width + y for x in range(x0, min(x0 + self.cluster_size, maze_puzzle.height))]
+                self.add_entrances(cells, 1, passable)
+
+    def add_entrances(self, border_cells: list[int], step: int, passable: CellBuffer) -> None:
+        run: list[int] = []
+        for cell in border_cells + [-1]:
+            if cell != -1 and passable[cell] and passable[cell + step]:
+                run.append(cell)
+                continue
+            if run:
+                transitions: list[int] = [run[0], run[-1]] if len(run) >= self.ENTRANCE_THRESHOLD \
+                    else [run[len(run) // 2]]
+                for transition in transitions:
+                    cost: int = self.maze_puzzle.get_move_cost_cells(transition, transition + step)
+                    self.add_edge(transition, transition + step, cost)
+                    self.add_edge(transition + step, transition, cost)
+                run = []
+
+    def index_clusters(self) -> None:
+        self.cluster_nodes = {}
+        for node in self.edges:
+            self.cluster_nodes.setdefault(self.get_cluster(node), set()).add(node)
+
+    def build_intra_edges(self) -> None:
+        self.index_clusters()
+        for nodes in self.cluster_nodes.values():
+            ordered_nodes: list[int] = sorted(nodes)
+            for i, node in enumerate(ordered_nodes):
+                # Стоимости симметричны: достаточно искать только узлы, идущие после node
+                costs, _ = self.search_cluster(node, set(ordered_nodes[i + 1:]))
+                for target, cost in costs.items():
+                    self.add_edge(node, target, cost)
+                    self.add_edge(target, node, cost)
+
+    def search_cluster(self, source: int, targets: set[int],
+                       stop_at: int = -1) -> tuple[dict[int, int], dict[int, int]]:
+        """Дейкстра, не выходящая за кластер source, на локальном массиве клеток кластера.
+            Возвращает стоимости до достигнутых targets и родителей (для stop_at - только его путь)."""
+        maze_puzzle: MazePuzzle = self.maze_puzzle
+        width: int = maze_puzzle.width
+        x0, x1, y0, y1 = self.get_cluster_bounds(source)
+        local_width: int = y1 - y0
+        local_size: int = (x1 - x0) * local_width
+        passable: bytes = b''.join(maze_puzzle.passable[x * width + y0:x * width + y1] for x in range(x0, x1))
+        cost_x: int = CostMove.STANDARD.value
+        cost_y: int = CostMove.GRAVITY.value
+
+        def to_local(cell: int) -> int:
+            x, y = divmod(cell, width)
+            return (x - x0) * local_width + y - y0
+
+        def to_global(local_cell: int) -> int:
+            x, y = divmod(local_cell, local_width)
+            return (x + x0) * width + y + y0
+
+        cluster: tuple[int, int] = self.get_cluster(source)
+        local_targets: set[int] = {to_local(cell) for cell in targets if self.get_cluster(cell) == cluster}
+        local_stop: int = to_local(stop_at) if stop_at != -1 else -1
+        distances: list[int] = [-1] * local_size
+        parents: list[int] = [-1] * local_size
+        local_source: int = to_local(source)
+        distances[local_source] = 0
+        found: dict[int, int] = {}
+        queue: list[tuple[int, int]] = [(0, local_source)]
+        while queue and len(found) < len(local_targets):
+            distance, cell = heapq.heappop(queue)
+            if distance > distances[cell] or cell in found:
+                continue
+            if cell in local_targets:
+                found[cell] = distance
+                if cell == local_stop:
+                    break
+            y: int = cell % local_width
+            neighbors: list[tuple[int, int]] = []
+            if y + 1 < local_width:
+                neighbors.append((cell + 1, cost_y))
+            if y > 0:
+                neighbors.append((cell - 1, cost_y))
+            if cell + local_width < local_size:
+                neighbors.append((cell + local_width, cost_x))
+            if cell >= local_width:
+                neighbors.append((cell - local_width, cost_x))
+            for neighbor, cost in neighbors:
+                if passable[neighbor]:
+                    new_distance: int = distance + cost
+                    if distances[neighbor] == -1 or new_distance < distances[neighbor]:
+                        distances[neighbor] = new_distance
+                        parents[neighbor] = cell
+                        heapq.heappush(queue, (new_distance, neighbor))
+
+        global_parents: dict[int, int] = {}
+        if local_stop in found:
+            cell = local_stop
+            while parents[cell] != -1:
+                global_parents[to_global(cell)] = to_global(parents[cell])
+                cell = parents[cell]
+        return {to_global(cell): distance for cell, distance in found.items()}, global_parents
+
+    def get_cluster_nodes(self, cell: int) -> set[int]:
+        return self.cluster_nodes.get(self.get_cluster(cell), set())
+
+    def find_abstract_path(self, start_cell: int, goal_cells: list[int]) -> list[int] | None:
+        if not self.is_valid:
+            raise MazeError('The maze has changed, rebuild the hierarchy!')
+        goals: set[int] = set(goal_cells)
+        # Старт и цели, не являющиеся узлами, временно подключаются к узлам своего кластера
+        extra_edges: dict[int, dict[int, int]] = {}
+        if start_cell not in self.edges:
+            costs, _ = self.search_cluster(start_cell, self.get_cluster_nodes(start_cell) | goals)
+            extra_edges[start_cell] = costs
+        for goal in goals - self.edges.keys():
+            costs, _ = self.search_cluster(goal, self.get_cluster_nodes(goal) | {start_cell})
+            for node, cost in costs.items():
+                extra_edges.setdefault(node, {})[goal] = cost
+
+        heuristic: Heuristic = make_manhattan_heuristic(self.maze_puzzle, goal_cells)
+        g_scores: dict[int, int] = {start_cell: 0}
+        parents: dict[int, int] = {}
+        closed_nodes: set[int] = set()
+        queue: list[tuple[float, int]] = [(heuristic(start_cell), start_cell)]
+        while queue:
+            _, node = heapq.heappop(queue)
+            if node in closed_nodes:
+                continue
+            closed_nodes.add(node)
+            if node in goals:
+                path: list[int] = [node]
+                while node in parents:
+                    node = parents[node]
+                    path.append(node)
+                return path[::-1]
+
+            g: int = g_scores[node]
+            for neighbors in (self.edges.get(node, {}), extra_edges.get(node, {})):
+                for neighbor, cost in neighbors.items():
+                    if neighbor not in closed_nodes and g + cost < g_scores.get(neighbor, g + cost + 1):
+                        g_scores[neighbor] = g + cost
+                        parents[neighbor] = node
+                        heapq.heappush(queue, (g + cost + heuristic(neighbor), neighbor))
+        return None
+
+    def refine_segment(self, origin: int, target: int) -> list[int]:
+        if self.get_cluster(origin) != self.get_cluster(target):
+            return [target]
+        _, parents = self.search_cluster(origin, {target}, stop_at=target)
+        segment: list[int] = [target]
+        while segment[-1] in parents:
+            segment.append(parents[segment[-1]])
+        segment.pop()
+        return segment[::-1]
+
+    def refine_path(self, abstract_path: list[int]) -> Iterator[list[int]]:
+        """Лениво отдаёт клетки пути по отрезкам между соседними абстрактными узлами."""
+        for origin, target in zip(abstract_path, abstract_path[1:]):
+            yield self.refine_segment(origin, target)
+
+    def iter_path(self, current_point: Point, goal_point: Point | None = None) -> Iterator[int] | None:
+        """Клетки пути от старта до цели. Абстрактный путь ищется сразу (None - пути нет),
+            а отрезки уточняются по мере чтения: идти можно, не дожидаясь уточнения всего пути."""
+        maze_puzzle: MazePuzzle = self.maze_puzzle
+        start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+        goal_cells: list[int] = maze_puzzle.goal_cells if goal_point is None \
+            else [maze_puzzle.get_cell(goal_point.x, goal_point.y)]
+        abstract_path: list[int] | None = self.find_abstract_path(start_cell, goal_cells)
+        if abstract_path is None:
+            return None
+        return chain([start_cell], chain.from_iterable(self.refine_path(abstract_path)))
+
+    def find_path(self, current_point: Point, goal_point: Point | None = None) -> Point | None:
+        """Весь путь сразу - цепочка Point, как у остальных алгоритмов."""
+        cells: Iterator[int] | None = self.iter_path(current_point, goal_point)
+        if cells is None:
+            return None
+        point: Point = self.maze_puzzle.get_point(next(cells))
+        for cell in cells:
+            next_point: Point = self.maze_puzzle.get_point(cell)
+            next_point.parent = point
+            point = next_point
+        return point
+
+    def save(self, file_name: str | Path) -> None:
+        nodes: array = array('i', self.edges)
+        sources: array = array('i')
+        targets: array = array('i')
+        costs: array = array('i')
+        for origin, neighbors in self.edges.items():
+            for target, cost in neighbors.items():
+                sources.append(origin)
+                targets.append(target)
+                costs.append(cost)
+        with open(file_name, 'wb') as file:
+            file.write(self.FILE_HEADER.pack(self.FILE_MAGIC, self.maze_puzzle.height, self.maze_puzzle.width,
+                                             self.cluster_size, zlib.crc32(self.maze_puzzle.grid),
+                                             len(nodes), len(costs)))
+            for values in (nodes, sources, targets, costs):
+                values.tofile(file)
+
+    @classmethod
+    def load(cls, file_name: str | Path, maze_puzzle: MazePuzzle) -> HierarchicalMaze:
+        with open(file_name, 'rb') as file:
+            header: bytes = file.read(cls.FILE_HEADER.size)
+            if len(header) != cls.FILE_HEADER.size:
+                raise MazeFormatError('Hierarchy file is too short!')
+            magic, height, width, cluster_size, checksum, node_count, edge_count = cls.FILE_HEADER.unpack(header)
+            if magic != cls.FILE_MAGIC:
+                raise MazeFormatError('Wrong hierarchy file signature!')
+            if (height, width, checksum) != (maze_puzzle.height, maze_puzzle.width, zlib.crc32(maze_puzzle.grid)):
+                raise MazeFormatError('Hierarchy file was built for another maze!')
+
+            nodes, sources, targets, costs = array('i'), array('i'), array('i'), array('i')
+            nodes.fromfile(file, node_count)
+            for values in (sources, targets, costs):
+                values.fromfile(file, edge_count)
+
+        hierarchical_maze: HierarchicalMaze = cls(maze_puzzle, cluster_size, build=False)
+        hierarchical_maze.edges = {node: {} for node in nodes}
+        for origin, target, cost in zip(sources, targets, costs):
+            hierarchical_maze.edges[origin][target] = cost
+        hierarchical_maze.index_clusters()
+        return hierarchical_maze
+
+
+def run_hpa(maze_puzzle: MazePuzzle, current_point: Point, cluster_size: int = 16) -> Point | None:
+    return HierarchicalMaze(maze_puzzle, cluster_size).find_path(current_point)
+
+
+def main() -> None:
+    print('---Hierarchical A-* Search---')
+    maze_puzzle: MazePuzzle = MazePuzzle()
+    starting_point: Point = Point(2, 2)
+
+    outcome: Point | None = run_hpa(maze_puzzle, starting_point, cluster_size=3)
+    if outcome:
+        path, length, cost = maze_puzzle.get_path(outcome)
+        print(f'Path Length: {length}')
+        print(f'Path Cost: {cost}')
+        print(' => '.join(map(str, path[::-1])))
+        print(maze_puzzle.overlay_points_on_map(path))
+
+    print('---Hierarchical A-* Search, first steps before full refinement---')
+    cells: Iterator[int] | None = HierarchicalMaze(maze_puzzle, cluster_size=3).iter_path(starting_point)
+    if cells is not None:
+        print(' => '.join(str(maze_puzzle.get_point(cell)) for cell in islice(cells, 3)))
+
+
+if __name__ == '__main__':
+    main()
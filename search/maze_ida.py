@@ -0,0 +1,160 @@
+from typing import Iterator
+
+from search.maze_astar import Heuristic, make_manhattan_heuristic, zero_heuristic
+from search.maze_puzzle import CostMove, MazePuzzle, Point
+from search.maze_stats import SearchStats
+
+
+class TranspositionCache:
+    """Маленький кэш лучших найденных стоимостей клеток в пределах одной итерации.
+        При переполнении вытесняются самые старые записи, так что память ограничена max_size."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size: int = max_size
+        self.costs: dict[int, float] = {}
+
+    def is_dominated(self, cell: int, cost: float) -> bool:
+        if self.max_size <= 0:
+            return False
+        if self.costs.get(cell, float('inf')) <= cost:
+            return True
+        self.costs[cell] = cost
+        if len(self.costs) > self.max_size:
+            del self.costs[next(iter(self.costs))]
+        return False
+
+    def clear(self) -> None:
+        self.costs.clear()
+
+
+def build_point_chain(maze_puzzle: MazePuzzle, path_cells: list[int]) -> Point:
+    point: Point = maze_puzzle.get_point(path_cells[0])
+    for cell in path_cells[1:]:
+        next_point: Point = maze_puzzle.get_point(cell)
+        next_point.parent = point
+        point = next_point
+    return point
+
+
+def has_reachable_goal(maze_puzzle: MazePuzzle, start_cell: int) -> bool:
+    """Заливка от старта. Без неё при недостижимой цели итерации перебирали бы все простые пути
+        до предельной границы; байт на клетку - столько же, сколько занимает сама сетка."""
+    visited: bytearray = bytearray(maze_puzzle.size)
+    visited[start_cell] = 1
+    stack: list[int] = [start_cell]
+    while stack:
+        cell: int = stack.pop()
+        if maze_puzzle.cell_is_goal(cell):
+            return True
+        for neighbor in maze_puzzle.get_neighbor_cells(cell):
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                stack.append(neighbor)
+    return False
+
+
+def search_with_bound(maze_puzzle: MazePuzzle, start_cell: int, bound: float, heuristic: Heuristic,
+                      cache: TranspositionCache, unit_cost: bool = False,
+                      stats: SearchStats | None = None) -> tuple[list[int] | None, float]:
+    """Поиск в глубину с отсечением по f = g + h > bound. Хранит только текущий путь,
+        поэтому память пропорциональна глубине решения. Возвращает путь или минимальное
+        превышение границы для следующей итерации.
+        Недостижимую цель run_iterations отсекает заливкой до первой итерации."""
+    path: list[int] = [start_cell]
+    g_scores: list[float] = [0]
+    neighbors: list[Iterator[int]] = [iter(maze_puzzle.get_neighbor_cells(start_cell))]
+    path_cells: set[int] = {start_cell}
+    next_bound: float = float('inf')
+    cache.clear()
+    while neighbors:
+        neighbor: int | None = next(neighbors[-1], None)
+        if neighbor is None:
+            path_cells.discard(path.pop())
+            g_scores.pop()
+            neighbors.pop()
+            continue
+        if neighbor in path_cells:
+            continue
+
+        g: float = g_scores[-1] + (1 if unit_cost else maze_puzzle.get_move_cost_cells(path[-1], neighbor))
+        f: float = g + heuristic(neighbor)
+        if f > bound:
+            next_bound = min(next_bound, f)
+            continue
+        if cache.is_dominated(neighbor, g):
+            continue
+
+        path.append(neighbor)
+        if stats is not None:
+            stats.expand(len(path))
+        if maze_puzzle.cell_is_goal(neighbor):
+            return path, g
+        path_cells.add(neighbor)
+        g_scores.append(g)
+        neighbors.append(iter(maze_puzzle.get_neighbor_cells(neighbor)))
+
+    return None, next_bound
+
+
+def run_ida_star(maze_puzzle: MazePuzzle, current_point: Point, heuristic: Heuristic | None = None,
+                 cache_size: int = 0, max_cost: float | None = None,
+                 stats: SearchStats | None = None) -> Point | None:
+    """Без max_cost граница ограничена size * GRAVITY - дороже простой путь быть не может.
+        В stats граница фронта - глубина текущего пути, а раскрытия считаются по всем итерациям
+        с повторами, поэтому visited_cells у IDA* и IDDFS тоже с повторами."""
+    if heuristic is None:
+        heuristic = make_manhattan_heuristic(maze_puzzle)
+    if max_cost is None:
+        max_cost = maze_puzzle.size * CostMove.GRAVITY.value
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    return run_iterations(maze_puzzle, start_cell, heuristic(start_cell), max_cost, heuristic, cache_size,
+                          False, stats)
+
+
+def run_iddfs(maze_puzzle: MazePuzzle, current_point: Point, max_depth: int | None = None,
+              cache_size: int = 0, stats: SearchStats | None = None) -> Point | None:
+    """Без max_depth глубина ограничена числом клеток - длиной самого длинного простого пути."""
+    if max_depth is None:
+        max_depth = maze_puzzle.size
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    return run_iterations(maze_puzzle, start_cell, 1, max_depth, zero_heuristic, cache_size, True, stats)
+
+
+def run_iterations(maze_puzzle: MazePuzzle, start_cell: int, bound: float, max_bound: float, heuristic: Heuristic,
+                   cache_size: int, unit_cost: bool, stats: SearchStats | None) -> Point | None:
+    """Общий цикл IDA* и IDDFS: граница растёт до найденного пути, до max_bound
+        или пока ни одна ветка не упёрлась в границу (next bound - бесконечность)."""
+    if stats is not None:
+        stats.start()
+    outcome: Point | None = None
+    if maze_puzzle.cell_is_goal(start_cell):
+        outcome = maze_puzzle.get_point(start_cell)
+    elif maze_puzzle.goal_cells and has_reachable_goal(maze_puzzle, start_cell):
+        cache: TranspositionCache = TranspositionCache(cache_size)
+        while bound != float('inf') and bound <= max_bound:
+            path, bound = search_with_bound(maze_puzzle, start_cell, bound, heuristic, cache, unit_cost, stats)
+            if path is not None:
+                outcome = build_point_chain(maze_puzzle, path)
+                break
+    if stats is not None:
+        stats.finish(stats.expanded_cells)
+    return outcome
+
+
+def main() -> None:
+    maze_puzzle: MazePuzzle = MazePuzzle()
+    starting_point: Point = Point(2, 2)
+    for title, run in (('---Iterative Deepening A-* Search---', run_ida_star),
+                       ('---Iterative Deepening Depth-first Search---', run_iddfs)):
+        print(title)
+        outcome: Point | None = run(maze_puzzle, starting_point)
+        if outcome:
+            path, length, cost = maze_puzzle.get_path(outcome)
+            print(f'Path Length: {length}')
+            print(f'Path Cost: {cost}')
+            print(' => '.join(map(str, path[::-1])))
+            print(maze_puzzle.overlay_points_on_map(path))
+
+
+if __name__ == '__main__':
+    main()
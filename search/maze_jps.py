@@ -0,0 +1,188 @@
+import heapq
+from array import array
+
+from search.maze_astar import Heuristic, make_manhattan_heuristic
+from search.maze_puzzle import CellBuffer, CostMove, MazePuzzle, Point
+from search.maze_stats import SearchStats
+
+
+class JumpPointSearch:
+    """Jump Point Search для 4-связной сетки MazePuzzle.
+        Стоимость шага постоянна вдоль каждой оси (CostMove), поэтому перестановки шагов
+        равноценны и симметричные пути можно отсекать: в очередь попадают только точки прыжка.
+        Движение по y только ищет вынужденных соседей, движение по x дополнительно
+        запускает боковые прыжки по y."""
+
+    def __init__(self, maze_puzzle: MazePuzzle) -> None:
+        self.maze_puzzle: MazePuzzle = maze_puzzle
+        self.width: int = maze_puzzle.width
+        self.height: int = maze_puzzle.height
+        self.passable: CellBuffer = maze_puzzle.passable
+        self.goal: int = ord(maze_puzzle.GOAL)
+        # Результаты прыжков общие для всех клеток одного отрезка: кэш заполняется лениво
+        # и переиспользуется последующими поисками в том же лабиринте
+        self.jump_caches: dict[tuple[int, int], array] = {}
+        self.version: int = maze_puzzle.version
+
+    UNKNOWN: int = -2
+
+    def is_passable(self, x: int, y: int) -> bool:
+        return 0 <= x < self.height and 0 <= y < self.width and self.passable[x * self.width + y] == 1
+
+    def get_jump_cache(self, dx: int, dy: int) -> array:
+        key: tuple[int, int] = (dx, dy)
+        if key not in self.jump_caches:
+            self.jump_caches[key] = array('i', [self.UNKNOWN]) * self.maze_puzzle.size
+        return self.jump_caches[key]
+
+    def jump_y(self, x: int, y: int, dy: int) -> int:
+        grid: CellBuffer = self.maze_puzzle.grid
+        is_passable = self.is_passable
+        jump_cache: array = self.get_jump_cache(0, dy)
+        cell: int = x * self.width + y
+        scanned_cells: list[int] = []
+        while (jump_point := jump_cache[cell]) == self.UNKNOWN:
+            scanned_cells.append(cell)
+            y += dy
+            if not is_passable(x, y):
+                jump_point = -1
+                break
+            cell = x * self.width + y
+            if grid[cell] == self.goal or \
+                    (is_passable(x - 1, y) and not is_passable(x - 1, y - dy)) or \
+                    (is_passable(x + 1, y) and not is_passable(x + 1, y - dy)):
+                jump_point = cell
+                break
+        for scanned_cell in scanned_cells:
+            jump_cache[scanned_cell] = jump_point
+        return int(jump_point)
+
+    def jump_x(self, x: int, y: int, dx: int) -> int:
+        grid: CellBuffer = self.maze_puzzle.grid
+        is_passable = self.is_passable
+        jump_cache: array = self.get_jump_cache(dx, 0)
+        cell: int = x * self.width + y
+        scanned_cells: list[int] = []
+        while (jump_point := jump_cache[cell]) == self.UNKNOWN:
+            scanned_cells.append(cell)
+            x += dx
+            if not is_passable(x, y):
+                jump_point = -1
+                break
+            cell = x * self.width + y
+            if grid[cell] == self.goal or \
+                    (is_passable(x, y - 1) and not is_passable(x - dx, y - 1)) or \
+                    (is_passable(x, y + 1) and not is_passable(x - dx, y + 1)) or \
+                    self.jump_y(x, y, 1) != -1 or self.jump_y(x, y, -1) != -1:
+                jump_point = cell
+                break
+        for scanned_cell in scanned_cells:
+            jump_cache[scanned_cell] = jump_point
+        return int(jump_point)
+
+    def get_directions(self, cell: int, parent: int) -> list[tuple[int, int]]:
+        if parent == -1:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        x, y = divmod(cell, self.width)
+        parent_x, parent_y = divmod(parent, self.width)
+        if x == parent_x:
+            dy: int = 1 if y > parent_y else -1
+            return [(0, dy), (1, 0), (-1, 0)]
+        dx: int = 1 if x > parent_x else -1
+        return [(dx, 0), (0, 1), (0, -1)]
+
+    def get_successors(self, cell: int, parent: int) -> list[int]:
+        x, y = divmod(cell, self.width)
+        successors: list[int] = []
+        for dx, dy in self.get_directions(cell, parent):
+            jump_point: int = self.jump_x(x, y, dx) if dx else self.jump_y(x, y, dy)
+            if jump_point != -1:
+                successors.append(jump_point)
+        return successors
+
+    def get_jump_cost(self, origin: int, target: int) -> int:
+        origin_x, origin_y = divmod(origin, self.width)
+        target_x, target_y = divmod(target, self.width)
+        return abs(origin_x - target_x) * CostMove.STANDARD.value + abs(origin_y - target_y) * CostMove.GRAVITY.value
+
+    def expand_path(self, cell: int, jump_parents: dict[int, int]) -> Point:
+        """Заполняет клетки между точками прыжка, чтобы get_path видел каждый шаг."""
+        last_point: Point = self.maze_puzzle.get_point(cell)
+        point: Point = last_point
+        while cell in jump_parents:
+            parent: int = jump_parents[cell]
+            step: int = 1 if parent // self.width == cell // self.width else self.width
+            if parent < cell:
+                step = -step
+            while cell != parent:
+                cell += step
+                point.parent = self.maze_puzzle.get_point(cell)
+                point = point.parent
+        return last_point
+
+    def search(self, start_cell: int, heuristic: Heuristic | None = None,
+               stats: SearchStats | None = None) -> Point | None:
+        """В stats раскрытыми считаются только точки прыжка, клетки, пройденные сканированием, - нет."""
+        if stats is not None:
+            stats.start()
+        maze_puzzle: MazePuzzle = self.maze_puzzle
+        if self.version != maze_puzzle.version:
+            self.jump_caches.clear()
+            self.version = maze_puzzle.version
+        if heuristic is None:
+            heuristic = make_manhattan_heuristic(maze_puzzle)
+
+        g_scores: dict[int, float] = {start_cell: 0}
+        jump_parents: dict[int, int] = {}
+        closed_cells: set[int] = set()
+        queue: list[tuple[float, float, int]] = [(heuristic(start_cell), 0, start_cell)]
+        outcome: Point | None = None
+        while queue:
+            _, negative_g, current_cell = heapq.heappop(queue)
+            if current_cell in closed_cells or -negative_g > g_scores[current_cell]:
+                continue
+            closed_cells.add(current_cell)
+            if stats is not None:
+                stats.expand(len(queue) + 1)
+
+            if maze_puzzle.cell_is_goal(current_cell):
+                outcome = self.expand_path(current_cell, jump_parents)
+                break
+
+            current_g: float = g_scores[current_cell]
+            for successor in self.get_successors(current_cell, jump_parents.get(current_cell, -1)):
+                if successor in closed_cells:
+                    continue
+                g: float = current_g + self.get_jump_cost(current_cell, successor)
+                if g < g_scores.get(successor, float('inf')):
+                    g_scores[successor] = g
+                    jump_parents[successor] = current_cell
+                    heapq.heappush(queue, (g + heuristic(successor), -g, successor))
+
+        if stats is not None:
+            stats.finish(len(closed_cells))
+        return outcome
+
+
+def run_jps(maze_puzzle: MazePuzzle, current_point: Point, heuristic: Heuristic | None = None,
+            stats: SearchStats | None = None) -> Point | None:
+    start_cell: int = maze_puzzle.get_cell(current_point.x, current_point.y)
+    return JumpPointSearch(maze_puzzle).search(start_cell, heuristic, stats)
+
+
+def main() -> None:
+    print('---Jump Point Search---')
+    maze_puzzle: MazePuzzle = MazePuzzle()
+    starting_point: Point = Point(2, 2)
+
+    outcome: Point | None = run_jps(maze_puzzle, starting_point)
+    if outcome:
+        path, length, cost = maze_puzzle.get_path(outcome)
+        print(f'Path Length: {length}')
+        print(f'Path Cost: {cost}')
+        print(' => '.join(map(str, path[::-1])))
+        print(maze_puzzle.overlay_points_on_map(path))
+
+
+if __name__ == '__main__':
+    main()
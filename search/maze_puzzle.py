@@ -1,7 +1,22 @@
 from __future__ import annotations
 
-import copy
+import struct
+from array import array
 from enum import Enum
+from pathlib import Path
+from typing import Callable
+
+
+class MazeError(Exception):
+    ...
+
+
+class MazeFormatError(MazeError):
+    ...
+
+
+# Сетка клеток: своя bytearray или представление чужого буфера (разделяемой памяти) только для чтения
+CellBuffer = bytearray | memoryview
 
 
 class Point:
@@ -39,7 +54,12 @@ class CostMove(Enum):
     GRAVITY: int = 5
 
 
+ChangeListener = Callable[['MazePuzzle', list[int]], None]
+
+
 class MazePuzzle:
+    """Лабиринт хранится плоским bytearray (по байту на клетку, построчно).
+    Клетка адресуется целым cell = x * width + y, проходимость вычислена заранее."""
     WALL: str = '#'
     EMPTY: str = '_'
     GOAL: str = '*'
@@ -49,39 +69,202 @@ class MazePuzzle:
                   Point(1, 0): 'EAST',
                   Point(-1, 0): 'WEST'}
 
-    def __init__(self) -> None:
-        self.maze: list[str] = ['*0000',
-                                '0###0',
-                                '0#0#0',
-                                '0#000',
-                                '00000']
+    BINARY_MAGIC: bytes = b'MAZE'
+    BINARY_HEADER: struct.Struct = struct.Struct('<4sII')  # magic, height, width
+
+    DEFAULT_MAZE: list[str] = ['*0000',
+                               '0###0',
+                               '0#0#0',
+                               '0#000',
+                               '00000']
+
+    def __init__(self, maze: list[str] | None = None) -> None:
+        rows: list[str] = self.DEFAULT_MAZE if maze is None else maze
+        if not rows or not rows[0]:
+            raise MazeFormatError('Maze must have at least one cell!')
+        width: int = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise MazeFormatError('All rows of the maze must have the same length!')
+
+        self._set_grid(bytearray(''.join(rows).encode('ascii')), len(rows), width)
+
+    def _set_grid(self, grid: bytearray, height: int, width: int) -> None:
+        if len(grid) != height * width:
+            raise MazeFormatError(f'Expected {height * width} cells, got {len(grid)}!')
+        self.height: int = height
+        self.width: int = width
+        self.size: int = height * width
+        self.grid: CellBuffer = grid
+        self.passable: CellBuffer = grid.translate(self._passable_table())
+        self.version: int = 0
+        self.change_listeners: list[ChangeListener] = []
+
+    @classmethod
+    def _passable_table(cls) -> bytes:
+        table: bytearray = bytearray([1]) * 256
+        table[ord(cls.WALL)] = 0
+        return bytes(table)
+
+    @classmethod
+    def from_grid(cls, grid: bytes | bytearray | memoryview, height: int, width: int) -> MazePuzzle:
+        maze_puzzle: MazePuzzle = cls.__new__(cls)
+        maze_puzzle._set_grid(bytearray(grid), height, width)
+        return maze_puzzle
+
+    @classmethod
+    def from_shared_buffer(cls, buffer: memoryview, height: int, width: int) -> MazePuzzle:
+        """Лабиринт поверх буфера [grid | passable] без копирования, например из SharedMemory.
+            Такой лабиринт только для чтения: update_cells для него не поддерживается."""
+        size: int = height * width
+        if len(buffer) < 2 * size:
+            raise MazeFormatError(f'Expected {2 * size} bytes of grid and passability, got {len(buffer)}!')
+        maze_puzzle: MazePuzzle = cls.__new__(cls)
+        maze_puzzle.height = height
+        maze_puzzle.width = width
+        maze_puzzle.size = size
+        maze_puzzle.grid = buffer[:size].toreadonly()
+        maze_puzzle.passable = buffer[size:2 * size].toreadonly()
+        maze_puzzle.version = 0
+        maze_puzzle.change_listeners = []
+        return maze_puzzle
+
+    @property
+    def is_read_only(self) -> bool:
+        return isinstance(self.grid, memoryview) and self.grid.readonly
+
+    @classmethod
+    def from_text_file(cls, file_name: str | Path) -> MazePuzzle:
+        with open(file_name, encoding='ascii') as file:
+            rows: list[str] = [line.rstrip('\r\n') for line in file if line.strip()]
+        return cls(rows)
+
+    @classmethod
+    def from_binary_file(cls, file_name: str | Path) -> MazePuzzle:
+        with open(file_name, 'rb') as file:
+            header: bytes = file.read(cls.BINARY_HEADER.size)
+            if len(header) != cls.BINARY_HEADER.size:
+                raise MazeFormatError('Binary maze file is too short!')
+            magic, height, width = cls.BINARY_HEADER.unpack(header)
+            if magic != cls.BINARY_MAGIC:
+                raise MazeFormatError('Wrong binary maze file signature!')
+            grid: bytes = file.read()
+        return cls.from_grid(grid, height, width)
+
+    def save_text_file(self, file_name: str | Path) -> None:
+        with open(file_name, 'w', encoding='ascii') as file:
+            file.write(str(self))
+            file.write('\n')
+
+    def save_binary_file(self, file_name: str | Path) -> None:
+        with open(file_name, 'wb') as file:
+            file.write(self.BINARY_HEADER.pack(self.BINARY_MAGIC, self.height, self.width))
+            file.write(self.grid)
+
+    @property
+    def maze(self) -> list[str]:
+        return [bytes(self.grid[i:i + self.width]).decode('ascii') for i in range(0, self.size, self.width)]
 
     def __str__(self) -> str:
         return '\n'.join(self.maze)
 
+    def is_within_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.height and 0 <= y < self.width
+
+    def get_cell(self, x: int, y: int) -> int:
+        if not self.is_within_bounds(x, y):
+            raise IndexError(f'Point ({x}, {y}) is out of the maze!')
+        return x * self.width + y
+
+    def get_point(self, cell: int) -> Point:
+        x, y = divmod(cell, self.width)
+        return Point(x, y)
+
     def __getitem__(self, point: Point) -> str:
-        return self.maze[point.x][point.y]
+        return chr(self.grid[self.get_cell(point.x, point.y)])
 
-    def get_neighbors(self, current_point: Point) -> list[Point]:
-        neighbors: list[Point] = []
-        for direction in self.DIRECTIONS:
-            target_point: Point = current_point + direction
-            try:
-                if self[target_point] != self.WALL:
-                    neighbors.append(target_point)
-            except IndexError:
-                pass
+    def update_cells(self, changes: dict[Point, str]) -> list[int]:
+        """Меняет клетки, увеличивает version и оповещает подписчиков об изменённых клетках."""
+        if self.is_read_only:
+            raise MazeError('The maze is a read-only view of a shared buffer!')
+        changed_cells: list[int] = []
+        for point, value in changes.items():
+            cell: int = self.get_cell(point.x, point.y)
+            code: int = ord(value)
+            if self.grid[cell] != code:
+                self.grid[cell] = code
+                self.passable[cell] = int(code != ord(self.WALL))
+                changed_cells.append(cell)
+
+        if changed_cells:
+            self.version += 1
+            for listener in list(self.change_listeners):
+                listener(self, changed_cells)
+        return changed_cells
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        self.change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: ChangeListener) -> None:
+        if listener in self.change_listeners:
+            self.change_listeners.remove(listener)
+
+    def get_neighbor_cells(self, cell: int) -> list[int]:
+        width: int = self.width
+        passable: CellBuffer = self.passable
+        y: int = cell % width
+        neighbors: list[int] = []
+        if y + 1 < width and passable[cell + 1]:
+            neighbors.append(cell + 1)
+        if y > 0 and passable[cell - 1]:
+            neighbors.append(cell - 1)
+        if cell + width < self.size and passable[cell + width]:
+            neighbors.append(cell + width)
+        if cell >= width and passable[cell - width]:
+            neighbors.append(cell - width)
         return neighbors
 
+    def get_neighbors(self, current_point: Point) -> list[Point]:
+        cell: int = self.get_cell(current_point.x, current_point.y)
+        return [self.get_point(neighbor) for neighbor in self.get_neighbor_cells(cell)]
+
+    def cell_is_goal(self, cell: int) -> bool:
+        return self.grid[cell] == ord(self.GOAL)
+
     def point_is_goal(self, point: Point) -> bool:
         return self[point] == self.GOAL
 
+    @property
+    def goal_cells(self) -> list[int]:
+        goal: int = ord(self.GOAL)
+        if isinstance(self.grid, memoryview):
+            # У memoryview нет find: проход по представлению вместо копии сетки
+            return [cell for cell, code in enumerate(self.grid) if code == goal]
+        cells: list[int] = []
+        cell: int = self.grid.find(goal)
+        while cell != -1:
+            cells.append(cell)
+            cell = self.grid.find(goal, cell + 1)
+        return cells
+
+    def new_parents(self) -> array:
+        return array('i', [-1]) * self.size
+
+    def build_point_chain(self, cell: int, parents: array) -> Point:
+        """Восстанавливает цепочку Point по массиву родителей (-1 у стартовой клетки)."""
+        last_point: Point = self.get_point(cell)
+        point: Point = last_point
+        parent: int = parents[cell]
+        while parent != -1:
+            point.parent = self.get_point(parent)
+            point = point.parent
+            parent = parents[parent]
+        return last_point
+
     def overlay_points_on_map(self, points: list[Point]) -> str:
-        overlay_map: list[str] = copy.deepcopy(self.maze)
+        overlay_map: bytearray = bytearray(self.grid)
         for point in points:
-            old_row: str = overlay_map[point.x]
-            overlay_map[point.x] = old_row[:point.y] + 'X' + old_row[point.y + 1:]
-        return '\n'.join(overlay_map)
+            overlay_map[self.get_cell(point.x, point.y)] = ord('X')
+        return '\n'.join(overlay_map[i:i + self.width].decode('ascii') for i in range(0, self.size, self.width))
 
     def get_path(self, point: Point) -> tuple[list[Point], int, float]:
         path: list[Point] = []
@@ -99,7 +282,5 @@ class MazePuzzle:
         direction: str = self.DIRECTIONS[move]
         return CostMove.GRAVITY.value if direction in ('NORTH', 'SOUTH') else CostMove.STANDARD.value
 
-    def determine_cost(self, origin: Point, target: Point) -> int:
-        cost: int = self.get_move_cost(origin, target)
-        _, distance_to_root, _ = self.get_path(target)
-        return distance_to_root + cost
+    def get_move_cost_cells(self, origin: int, target: int) -> int:
+        return CostMove.GRAVITY.value if origin // self.width == target // self.width else CostMove.STANDARD.value
@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+
+
+@dataclass
+class SearchStats:
+    """Счётчики одного запуска поиска. Алгоритмы заполняют их, только если stats передан,
+        поэтому без сбора статистики цена - одна проверка на None за раскрытие."""
+    expanded_cells: int = 0
+    peak_frontier: int = 0
+    visited_cells: int = 0
+    wall_time: float = 0.0
+    started_at: float = field(default=0.0, repr=False)
+
+    def start(self) -> None:
+        self.started_at = perf_counter()
+
+    def expand(self, frontier_size: int) -> None:
+        self.expanded_cells += 1
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+
+    def finish(self, visited_cells: int) -> None:
+        self.visited_cells = visited_cells
+        self.wall_time = perf_counter() - self.started_at
+
+    @property
+    def expansions_per_second(self) -> float:
+        return self.expanded_cells / self.wall_time if self.wall_time else 0.0